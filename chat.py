@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 import asyncio
 import sys
+import time
+from collections import deque
 from finance_bot import NPCIGrievanceBot
 
 async def main():
@@ -20,12 +22,19 @@ async def main():
     print("   • 'stream on/off' - Toggle streaming mode")
     print("   • 'quit' or 'exit' - Exit the chat\n")
     
-    # Store conversation history
-    conversation_history = []
+    # Store conversation history - bounded deque evicts the oldest messages
+    # automatically, so no slicing/copying is needed after each turn.
+    # Entries are only ever appended at the tail; keeping the prefix stable
+    # maximizes provider-side prompt/KV cache hits, so never re-sort or
+    # rewrite earlier turns. The bot receives an immutable tuple snapshot
+    # so downstream code can't reorder the history in place.
+    conversation_history = deque(maxlen=20)
     streaming_enabled = True  # Default to streaming enabled
     
     while True:
-        user = input("You: ")
+        # Read input on a worker thread so the event loop isn't blocked while
+        # the user types (background tasks keep running during think-time)
+        user = await asyncio.to_thread(input, "You: ")
         if user.lower() in {"quit", "exit"}:
             break
         
@@ -42,26 +51,36 @@ async def main():
         if streaming_enabled:
             # Stream the response
             print("NPCI Bot: ", end="", flush=True)
-            full_response = ""
-            
+            parts = []
+
             try:
-                async for chunk in bot.stream_message(user, "interactive_user", conversation_history):
-                    print(chunk, end="", flush=True)
-                    full_response += chunk
+                # Coalesce flushes: one write() per chunk but at most one
+                # flush every ~30ms (or on sentence boundary) instead of a
+                # syscall per token; join parts once at the end to avoid
+                # O(n^2) string concatenation
+                last_flush = time.monotonic()
+                async for chunk in bot.stream_message(user, "interactive_user", tuple(conversation_history)):
+                    parts.append(chunk)
+                    sys.stdout.write(chunk)
+                    now = time.monotonic()
+                    if now - last_flush > 0.03 or chunk.endswith(('.', '!', '?')):
+                        sys.stdout.flush()
+                        last_flush = now
+                sys.stdout.flush()
                 print()  # New line after streaming
                 
                 # Show context information
                 metadata = {"context_messages": len(conversation_history) + 1}
                 context_info = f" [Context: {metadata.get('context_messages', 1)} msgs, Streamed]" if metadata.get('context_messages', 1) > 1 else " [Streamed]"
                 print(f"{context_info}")
-                
-                bot_response = full_response
+
+                bot_response = "".join(parts)
                 
             except Exception as e:
                 print(f"\n❌ Streaming error: {e}")
                 print("🔄 Falling back to non-streaming mode...")
                 # Fallback to non-streaming
-                res = await bot.process_message(user, "interactive_user", conversation_history)
+                res = await bot.process_message(user, "interactive_user", tuple(conversation_history))
                 bot_response = res.get("response", res.get('error'))
                 
                 # Show context information
@@ -70,7 +89,7 @@ async def main():
                 print(f"NPCI Bot{context_info}: {bot_response}")
         else:
             # Non-streaming mode (original behavior)
-            res = await bot.process_message(user, "interactive_user", conversation_history)
+            res = await bot.process_message(user, "interactive_user", tuple(conversation_history))
             bot_response = res.get("response", res.get('error'))
             
             # Show context information
@@ -79,14 +98,10 @@ async def main():
             
             print(f"NPCI Bot{context_info}: {bot_response}")
         
-        # Update conversation history
+        # Update conversation history (maxlen=20 keeps the last 10 exchanges)
         conversation_history.append({"role": "user", "content": user})
         conversation_history.append({"role": "assistant", "content": bot_response})
-        
-        # Keep only last 20 messages (10 exchanges) to prevent memory overflow
-        if len(conversation_history) > 20:
-            conversation_history = conversation_history[-20:]
-        
+
         print()
 
 if __name__ == "__main__":
@@ -1,12 +1,165 @@
 from typing import Dict, List, Optional
 from datetime import datetime
-import json
-import requests
+import asyncio
+import atexit
+import functools
+import itertools
+import random
+import re
+import time
+import aiohttp
 from nemoguardrails.actions import action
 import os
 
-# Mock database for demonstration
-grievances_db = []
+# Prefer orjson's C serializer for grievance payloads when it is installed;
+# fall back to stdlib json so the dependency stays optional
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    _dumps = json.dumps
+    _loads = json.loads
+
+# Precompiled sensitive-data patterns (compiled once at import, these run on every message)
+_CC_RE = re.compile(r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b')
+_SSN_RE = re.compile(r'\b\d{3}-\d{2}-\d{4}\b')
+_PHONE_RE = re.compile(r'\b\d{3}-\d{3}-\d{4}\b')
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+_SENSITIVE_PATTERNS = (
+    ("credit_card", _CC_RE),
+    ("ssn", _SSN_RE),
+    ("phone", _PHONE_RE),
+    ("email", _EMAIL_RE),
+)
+
+
+# Compliance term groups (order of _SENSITIVE_TERMS drives issue ordering)
+_SENSITIVE_TERMS = ("credit card", "ssn", "social security", "password", "pin")
+
+# Word tokenizer and exact-token sets for checks where whole-word matches
+# are intended - set intersection is O(1) per token vs a substring scan
+# per keyword
+_WORD_RE = re.compile(r"[a-z']+")
+_PROFESSIONAL_TOKENS = frozenset({"please", "thank", "apologize", "understand", "assist", "help"})
+
+_SENSITIVE_TERM_RE = re.compile(
+    r"credit card|social security|\bpassword\b|\bpin\b|\bssn\b", re.IGNORECASE
+)
+_INVESTMENT_RE = re.compile(r"invest|stock|bond|portfolio|return", re.IGNORECASE)
+# Word boundaries so whole words match, not substrings ("hello" is not "hell")
+_ABUSIVE_RE = re.compile(r"\b(?:damn|hell|stupid|idiot|hate)\b", re.IGNORECASE)
+
+# One compiled pattern per category, each run with its own C-level scan.
+# A single fused alternation would be one pass, but a consuming alternation
+# drops hits that overlap an earlier category's match (the email in
+# "pin@bank.com" swallows "pin"), and losing sensitive-term hits is a
+# correctness problem, not an optimization target.
+_SCAN_PATTERNS = (
+    ("credit_card", _CC_RE),
+    ("ssn", _SSN_RE),
+    ("phone", _PHONE_RE),
+    ("email", _EMAIL_RE),
+    ("sensitive_term", _SENSITIVE_TERM_RE),
+    ("investment", _INVESTMENT_RE),
+    ("abusive", _ABUSIVE_RE),
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _scan_message(message: str) -> Dict[str, tuple]:
+    """Per-category scan shared by the compliance and validation actions."""
+    buckets: Dict[str, tuple] = {}
+    for group, pattern in _SCAN_PATTERNS:
+        hits = pattern.findall(message)
+        if hits:
+            buckets[group] = tuple(hits)
+    return buckets
+
+
+def _fresh(value):
+    """Recursively copy a cached or static payload for one caller.
+
+    Memoized results and the precomputed response payloads are shared
+    across callers; handing out the stored dict (or a shallow copy that
+    still shares its nested lists) lets one caller's mutation poison every
+    later response. Leaves are strings/numbers, so copying containers is
+    enough.
+    """
+    if isinstance(value, dict):
+        return {k: _fresh(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fresh(v) for v in value]
+    return value
+
+
+def _keyword_re(keywords) -> "re.Pattern":
+    """Compile a keyword list into a single case-insensitive alternation."""
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+
+# Intent classification patterns - compiled once so each message needs a single
+# C-level scan per category instead of a Python loop over keyword lists.
+# Off-topic/non-NPCI patterns keep word boundaries to prevent false matches.
+_OFF_TOPIC_RE = re.compile(
+    r'\bllm\b|\bai\b|\bartificial intelligence\b|\bmachine learning\b|\bchatbot\b|'
+    r'\bweather\b|\bsports\b|\bpolitics\b|\bentertainment\b|\bpersonal life\b|'
+    r'\bphilosophy\b|\breligion\b|\bwhat is like to be\b|\bhow does it feel\b|'
+    r'\byour experience\b|\byour thoughts\b|\byour opinion\b|\bloan\b|\bcredit card bill\b|'
+    r'\binvestment\b|\binsurance\b|\bmutual fund\b|\bstock\b|\bforex\b',
+    re.IGNORECASE,
+)
+_UPI_RE = _keyword_re(["upi", "unified payment", "payment failed", "money debited", "upi id", "upi pin", "phonepe", "gpay", "paytm", "bhim"])
+_RUPAY_RE = _keyword_re(["rupay", "debit card", "atm card", "card not working", "card declined", "card blocked"])
+_MANDATE_RE = _keyword_re(["nach", "mandate", "auto debit", "emi", "autopay", "standing instruction", "si", "recurring payment"])
+_IMPS_RE = _keyword_re(["imps", "immediate payment", "instant transfer", "money transfer", "beneficiary"])
+_NETC_RE = _keyword_re(["fastag", "netc", "toll", "toll payment", "blacklist", "recharge"])
+_BBPS_RE = _keyword_re(["bbps", "bill payment", "utility bill", "electricity bill", "water bill", "gas bill"])
+_GRIEVANCE_RE = _keyword_re(["complaint", "issue", "problem", "grievance", "dispute", "unhappy", "dissatisfied", "error", "failed", "not working"])
+_NPCI_SERVICE_RE = _keyword_re(["npci", "what is npci", "transaction limit", "service hours", "contact", "helpline", "support"])
+
+# (pattern, category, confidence) in priority order - off-topic always wins.
+# Each category keeps its own compiled pattern: one fused alternation would
+# consume overlapping keywords ("bill payment" eating the "payment failed"
+# that should classify as UPI), and search() per category early-exits as soon
+# as the highest-priority match is found anyway.
+_INTENT_PRIORITY = (
+    (_OFF_TOPIC_RE, "off_topic", 0.95),
+    (_UPI_RE, "upi_related", 0.9),
+    (_RUPAY_RE, "rupay_related", 0.9),
+    (_MANDATE_RE, "mandate_related", 0.9),
+    (_IMPS_RE, "imps_related", 0.9),
+    (_NETC_RE, "netc_related", 0.9),
+    (_BBPS_RE, "bbps_related", 0.9),
+    (_GRIEVANCE_RE, "general_grievance", 0.8),
+    (_NPCI_SERVICE_RE, "npci_inquiry", 0.8),
+)
+
+# Mock database for demonstration - keyed by grievance_id for O(1) lookups
+grievances_db: Dict[str, Dict] = {}
+
+# Monotonic ticket counter - next() is atomic under the GIL, so concurrent
+# create_grievance coroutines can never mint duplicate IDs (a read-increment
+# on a plain int or len(grievances_db) would race)
+_grievance_counter = itertools.count(1)
+
+# NPCI-specific grievance categories - frozenset for O(1) membership, built
+# once instead of a fresh list per create_grievance call
+_VALID_CATEGORIES = frozenset({
+    "upi_transaction_failure", "upi_money_debited", "upi_id_issues", "upi_limit_exceeded",
+    "rupay_card_not_working", "rupay_transaction_declined", "rupay_reward_issues",
+    "nach_mandate_failure", "nach_payment_bounce", "nach_auto_debit_issues",
+    "imps_transfer_failed", "imps_beneficiary_issues", "imps_limit_issues",
+    "netc_fastag_issues", "netc_double_deduction", "netc_balance_issues",
+    "bbps_payment_failed", "bbps_duplicate_payment", "bbps_receipt_issues",
+    "general_npci_query", "technical_issues", "other"
+})
 
 # NPCI Service Information Database
 npci_services_db = {
@@ -46,27 +199,60 @@ mandate_types = {
 # Legacy accounts database - not used for NPCI services
 accounts_db = {}
 
-@action()
-async def llama_guard_api_check(user_message: str) -> Dict:
-    """Use Llama Guard via Hugging Face Inference API"""
-    
-    # Hugging Face Inference API endpoint
-    API_URL = "https://api-inference.huggingface.co/models/meta-llama/LlamaGuard-7b"
-    
-    # Get API key from environment
-    hf_token = os.getenv("HUGGINGFACE_API_KEY")
-    if not hf_token:
-        return {
-            "is_safe": True,  # Fail open if no API key
-            "assessment": "no_api_key",
-            "violated_categories": [],
-            "source": "fallback"
-        }
-    
-    headers = {"Authorization": f"Bearer {hf_token}"}
-    
-    # Llama Guard prompt format
-    llama_guard_prompt = f"""<s>[INST] Task: Check if there is unsafe content in 'User' messages in conversations according to our safety policy with the below categories.
+# Pooled HTTP session for the Llama Guard calls - created lazily on first use
+# (aiohttp sessions must be built inside a running event loop) and shared so
+# concurrent guard checks reuse keep-alive connections instead of handshaking
+# per request.
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60, ttl_dns_cache=300)
+        )
+    return _SESSION
+
+
+@atexit.register
+def _close_session():
+    if _SESSION is not None and not _SESSION.closed:
+        try:
+            asyncio.run(_SESSION.close())
+        except RuntimeError:
+            pass  # interpreter is tearing down an already-running loop
+
+# Verdict cache for Llama Guard - repeated messages ("hi", "help", retries)
+# return the stored verdict instead of paying a fresh network round-trip.
+# Entries expire after a TTL so moderation policy changes still propagate.
+_GUARD_CACHE: Dict[str, tuple] = {}
+_GUARD_CACHE_MAX = 4096
+_GUARD_CACHE_TTL = 300.0  # seconds
+
+# In-flight guard calls keyed like the cache, for single-flight coalescing
+_GUARD_INFLIGHT: Dict[str, "asyncio.Future"] = {}
+
+# Static fail-open verdicts - built once so the no-key and model-loading
+# paths (the common case when HF is unavailable) allocate nothing per call.
+# Callers treat verdicts as read-only, so sharing the dicts is safe.
+_FALLBACK_NO_KEY = {
+    "is_safe": True,  # Fail open if no API key
+    "assessment": "no_api_key",
+    "violated_categories": [],
+    "source": "fallback"
+}
+_FALLBACK_MODEL_LOADING = {
+    "is_safe": True,  # Fail open
+    "assessment": "model_loading",
+    "violated_categories": [],
+    "full_response": "Model is loading, please try again",
+    "source": "fallback"
+}
+
+# Llama Guard prompt split around the one dynamic slot so each call does a
+# single concatenation instead of rebuilding the ~1 KB static body
+_LLAMA_GUARD_PROMPT_PREFIX = """<s>[INST] Task: Check if there is unsafe content in 'User' messages in conversations according to our safety policy with the below categories.
 
 <BEGIN UNSAFE CONTENT CATEGORIES>
 O1: Violence and Hate.
@@ -79,90 +265,297 @@ O7: Financial crimes and fraud.
 <END UNSAFE CONTENT CATEGORIES>
 
 <BEGIN CONVERSATION>
-User: {user_message}
+User: """
+
+_LLAMA_GUARD_PROMPT_SUFFIX = """
 <END CONVERSATION>
 
 Provide your safety assessment for User in the above conversation:
 - First line must be 'safe' or 'unsafe'
 - If unsafe, provide a second line that lists the violated categories. [/INST]"""
 
+# Generation parameters never change between calls
+_HF_PARAMS = {
+    "max_new_tokens": 50,
+    "temperature": 0.0,
+    "return_full_text": False
+}
+_HF_OPTIONS = {"use_cache": True}
+
+# Circuit breaker for HF model warmup: while the model is loading every call
+# would 503, so remember the cooldown deadline and fail open locally instead
+# of hammering the endpoint
+_model_loading_until = 0.0
+
+# HF endpoint and auth resolved once at import - no getenv or header dict
+# rebuild per guard call. X-use-cache lets the provider serve its own cached
+# completion for repeated prompts.
+_HF_API_URL = "https://api-inference.huggingface.co/models/meta-llama/LlamaGuard-7b"
+_HF_TOKEN = os.getenv("HUGGINGFACE_API_KEY")
+_HF_HEADERS = (
+    {
+        "Authorization": f"Bearer {_HF_TOKEN}",
+        "X-use-cache": "true",
+        "Content-Type": "application/json",
+        # Compressed responses matter most for batched verdict arrays
+        "Accept-Encoding": "gzip",
+    }
+    if _HF_TOKEN else None
+)
+
+
+@action()
+async def llama_guard_api_check(user_message: str) -> Dict:
+    """Use Llama Guard via Hugging Face Inference API"""
+    # Auth headers are prebuilt at import; missing key fails open
+    if _HF_HEADERS is None:
+        return _fresh(_FALLBACK_NO_KEY)
+
+    # Model still warming up from a recent 503 - don't touch the network
+    if time.time() < _model_loading_until:
+        return _fresh(_FALLBACK_MODEL_LOADING)
+
+    # Exact-match cache on the normalized message
+    cache_key = user_message.strip().lower()
+    cached = _GUARD_CACHE.get(cache_key)
+    if cached is not None:
+        verdict, stored_at = cached
+        if time.time() - stored_at < _GUARD_CACHE_TTL:
+            return _fresh(verdict)
+        del _GUARD_CACHE[cache_key]
+
+    # Single-flight: concurrent callers with the same message wait on the one
+    # in-flight API call instead of each issuing their own
+    pending = _GUARD_INFLIGHT.get(cache_key)
+    if pending is not None:
+        return _fresh(await asyncio.shield(pending))
+
+    task = asyncio.ensure_future(_guard_api_call(user_message, cache_key))
+    _GUARD_INFLIGHT[cache_key] = task
     try:
-        # Call Hugging Face API
-        response = requests.post(
-            API_URL,
-            headers=headers,
-            json={
-                "inputs": llama_guard_prompt,
-                "parameters": {
-                    "max_new_tokens": 50,
-                    "temperature": 0.0,
-                    "return_full_text": False
-                }
-            },
-            timeout=15  # 15 second timeout for API
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            
-            # Handle different response formats
-            if isinstance(result, list) and len(result) > 0:
-                llama_response = result[0].get("generated_text", "").strip()
-            elif isinstance(result, dict):
-                llama_response = result.get("generated_text", "").strip()
-            else:
-                llama_response = str(result).strip()
-            
-            # Parse Llama Guard response
-            lines = llama_response.split('\n')
-            safety_assessment = lines[0].lower().strip() if lines else "safe"
-            is_safe = safety_assessment == "safe"
-            
-            violated_categories = []
-            if not is_safe and len(lines) > 1:
-                violated_categories = [cat.strip() for cat in lines[1].split(',')]
-            
-            return {
-                "is_safe": is_safe,
-                "assessment": safety_assessment,
-                "violated_categories": violated_categories,
-                "full_response": llama_response,
-                "source": "huggingface_api"
-            }
-            
-        elif response.status_code == 503:
-            # Model loading - common with HF API
-            return {
-                "is_safe": True,  # Fail open
-                "assessment": "model_loading",
-                "violated_categories": [],
-                "full_response": "Model is loading, please try again",
-                "source": "fallback"
-            }
-        else:
-            # Other API errors
-            return {
-                "is_safe": True,  # Fail open
-                "assessment": "api_error",
-                "violated_categories": [],
-                "full_response": f"HTTP {response.status_code}: {response.text}",
-                "source": "fallback"
-            }
-            
-    except requests.exceptions.RequestException as e:
+        return _fresh(await task)
+    finally:
+        _GUARD_INFLIGHT.pop(cache_key, None)
+
+
+async def _guard_api_call(user_message: str, cache_key: str) -> Dict:
+    """Route one message through the batching worker and cache the verdict."""
+    _ensure_batch_worker()
+    fut = asyncio.get_running_loop().create_future()
+    await _batch_queue.put((user_message, fut))
+    verdict = await fut
+
+    # Only real API verdicts are cached; fallbacks stay uncached so recovery
+    # from outages is retried on the next message
+    if verdict["source"] == "huggingface_api":
+        if len(_GUARD_CACHE) >= _GUARD_CACHE_MAX:
+            _GUARD_CACHE.pop(next(iter(_GUARD_CACHE)))
+        _GUARD_CACHE[cache_key] = (verdict, time.time())
+    return verdict
+
+
+def _parse_guard_text(llama_response: str) -> Dict:
+    """Parse one Llama Guard completion into the verdict dict."""
+    lines = llama_response.split('\n')
+    safety_assessment = lines[0].lower().strip() if lines else "safe"
+    is_safe = safety_assessment == "safe"
+
+    violated_categories = []
+    if not is_safe and len(lines) > 1:
+        violated_categories = [cat.strip() for cat in lines[1].split(',')]
+
+    return {
+        "is_safe": is_safe,
+        "assessment": safety_assessment,
+        "violated_categories": violated_categories,
+        "full_response": llama_response,
+        "source": "huggingface_api"
+    }
+
+
+def _generated_text(item) -> str:
+    """Extract generated_text from the formats the HF API may return."""
+    if isinstance(item, list) and len(item) > 0:
+        return item[0].get("generated_text", "").strip()
+    if isinstance(item, dict):
+        return item.get("generated_text", "").strip()
+    return str(item).strip()
+
+
+# Retry budget for 503 (model loading): a quick in-request retry often gets a
+# real verdict during warmup instead of failing open
+_GUARD_MAX_ATTEMPTS = 3
+
+
+async def _guard_api_batch(messages: List[str]) -> List[Dict]:
+    """One HF round-trip (with bounded 503 retries) for a coalesced batch."""
+    global _model_loading_until
+
+    prompts = [
+        f"{_LLAMA_GUARD_PROMPT_PREFIX}{message}{_LLAMA_GUARD_PROMPT_SUFFIX}"
+        for message in messages
+    ]
+    body = _dumps({
+        "inputs": prompts,
+        "parameters": _HF_PARAMS,
+        "options": _HF_OPTIONS
+    })
+
+    try:
+        # Call Hugging Face API on the pooled session so concurrent guard
+        # checks overlap on network I/O instead of blocking the event loop
+        session = await _get_session()
+        for attempt in range(_GUARD_MAX_ATTEMPTS):
+            async with session.post(
+                _HF_API_URL,
+                headers=_HF_HEADERS,
+                # Serialized once with orjson when available instead of
+                # aiohttp's stdlib-json default per attempt
+                data=body,
+                timeout=aiohttp.ClientTimeout(total=15)  # 15 second timeout for API
+            ) as response:
+                if response.status == 503 and attempt < _GUARD_MAX_ATTEMPTS - 1:
+                    # Exponential backoff with jitter, whole batch together
+                    await asyncio.sleep(0.2 * (1 << attempt) + random.uniform(0, 0.1))
+                    continue
+                return await _handle_guard_response(response, len(prompts))
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         # Network/timeout errors
-        return {
+        return [{
             "is_safe": True,  # Fail open for availability
             "assessment": "network_error",
             "violated_categories": [],
             "full_response": str(e),
             "source": "fallback"
-        }
+        }] * len(prompts)
+
+
+async def _handle_guard_response(response, n_prompts: int) -> List[Dict]:
+    """Turn one HTTP response into a verdict per batched prompt."""
+    global _model_loading_until
+
+    if response.status == 200:
+        # Decode the raw bytes with orjson when available - the C parser
+        # beats stdlib json and skips the content-type check. HF occasionally
+        # returns plain-text errors with a 200; treat those as the raw string
+        # instead of raising mid-verdict.
+        body = await response.read()
+        try:
+            result = _loads(body)
+        except ValueError:
+            result = body.decode(errors="replace")
+
+        # List input yields one result per prompt; anything else is treated
+        # as a single-item response
+        if isinstance(result, list) and len(result) == n_prompts:
+            return [_parse_guard_text(_generated_text(item)) for item in result]
+        verdict = _parse_guard_text(_generated_text(result))
+        return [verdict] * n_prompts
+
+    if response.status == 503:
+        # Model loading - common with HF API. Honor Retry-After so subsequent
+        # calls skip the network until the cooldown passes
+        try:
+            retry_after = int(response.headers.get("Retry-After", 0))
+        except ValueError:
+            retry_after = 0
+        _model_loading_until = time.time() + max(30, retry_after)
+        return [_FALLBACK_MODEL_LOADING] * n_prompts
+
+    # Other API errors
+    return [{
+        "is_safe": True,  # Fail open
+        "assessment": "api_error",
+        "violated_categories": [],
+        "full_response": f"HTTP {response.status}: {await response.text()}",
+        "source": "fallback"
+    }] * n_prompts
+
+
+# Micro-batching: bursts of guard checks are coalesced into one HF call with
+# list inputs, amortizing the RPC overhead across up to _BATCH_MAX messages
+# while adding at most _BATCH_WAIT of latency
+_BATCH_MAX = 8
+_BATCH_WAIT = 0.02  # seconds
+_batch_queue: Optional["asyncio.Queue"] = None
+_batch_worker_task = None
+_batch_loop = None
+
+
+def _ensure_batch_worker():
+    """Start (or restart) the batch worker for the running event loop.
+
+    The queue and worker belong to the loop that created them; a worker
+    parked on a dead loop is not .done(), so the loop identity is checked
+    explicitly - otherwise a multi-loop process (pytest, TestClient) would
+    enqueue onto a stale queue and wait forever.
+    """
+    global _batch_queue, _batch_worker_task, _batch_loop
+    loop = asyncio.get_running_loop()
+    if (
+        loop is not _batch_loop
+        or _batch_worker_task is None
+        or _batch_worker_task.done()
+    ):
+        _batch_loop = loop
+        _batch_queue = asyncio.Queue()
+        _batch_worker_task = loop.create_task(_batch_worker(_batch_queue))
+
+
+async def _batch_worker(queue: "asyncio.Queue"):
+    # The queue is an argument so a restart for a newer loop cannot swap it
+    # out from under a batch in flight
+    while True:
+        batch = [await queue.get()]
+        deadline = time.monotonic() + _BATCH_WAIT
+        while len(batch) < _BATCH_MAX:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        try:
+            verdicts = await _guard_api_batch([message for message, _ in batch])
+        except asyncio.CancelledError as e:
+            # Worker cancelled mid-batch: don't strand the waiters
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            raise
+        except Exception as e:
+            # _guard_api_batch nets ClientError/TimeoutError itself; anything
+            # else would previously kill the worker and strand every queued
+            # future. Fail open like the other guard fallbacks and keep going.
+            verdicts = [{
+                "is_safe": True,
+                "assessment": "worker_error",
+                "violated_categories": [],
+                "full_response": str(e),
+                "source": "fallback"
+            }] * len(batch)
+        for (_, fut), verdict in zip(batch, verdicts):
+            if not fut.done():
+                fut.set_result(verdict)
 
 @action()
 async def llama_guard_with_fallback(user_message: str) -> Dict:
     """Llama Guard with intelligent fallback to existing checks"""
-    
+
+    # Cheap local prefilter: an unambiguous jailbreak hit decides the verdict
+    # without paying the HF round-trip at all
+    prefilter = await simple_jailbreak_check(user_message)
+    if prefilter["is_jailbreak"]:
+        return {
+            "is_safe": False,
+            "assessment": "local_pattern_check",
+            "violated_categories": ["jailbreak"],
+            "full_response": "Blocked by local jailbreak prefilter",
+            "source": "fallback_patterns"
+        }
+
     # Try Llama Guard API first
     llama_result = await llama_guard_api_check(user_message)
     
@@ -184,23 +577,13 @@ async def llama_guard_with_fallback(user_message: str) -> Dict:
 @action()
 async def create_grievance(user_id: str, category: str, description: str, priority: str = "medium", service_type: str = "general") -> Dict:
     """Create a new NPCI grievance ticket for the user."""
-    grievance_id = f"NPCI{len(grievances_db) + 1:06d}"
-    
-    # NPCI-specific grievance categories
-    valid_categories = [
-        "upi_transaction_failure", "upi_money_debited", "upi_id_issues", "upi_limit_exceeded",
-        "rupay_card_not_working", "rupay_transaction_declined", "rupay_reward_issues",
-        "nach_mandate_failure", "nach_payment_bounce", "nach_auto_debit_issues",
-        "imps_transfer_failed", "imps_beneficiary_issues", "imps_limit_issues",
-        "netc_fastag_issues", "netc_double_deduction", "netc_balance_issues",
-        "bbps_payment_failed", "bbps_duplicate_payment", "bbps_receipt_issues",
-        "general_npci_query", "technical_issues", "other"
-    ]
-    
+    grievance_id = f"NPCI{next(_grievance_counter):06d}"
+
     # Default to general if invalid category
-    if category not in valid_categories:
+    if category not in _VALID_CATEGORIES:
         category = "general_npci_query"
     
+    now = datetime.now()
     grievance = {
         "id": grievance_id,
         "user_id": user_id,
@@ -209,12 +592,14 @@ async def create_grievance(user_id: str, category: str, description: str, priori
         "description": description,
         "priority": priority,
         "status": "open",
-        "created_at": datetime.now().isoformat(),
+        "created_at": now.isoformat(),
+        # Epoch timestamp lets SLA checks subtract floats instead of reparsing ISO strings
+        "created_epoch": now.timestamp(),
         "assigned_to": "NPCI_Support_Team",
         "expected_resolution": "7-10 working days",
         "escalation_level": 1
     }
-    grievances_db.append(grievance)
+    grievances_db[grievance_id] = grievance
     
     return {
         "success": True,
@@ -228,42 +613,42 @@ async def create_grievance(user_id: str, category: str, description: str, priori
 @action()
 async def get_account_info(account_id: str) -> Dict:
     """Retrieve account information for a given account ID."""
-    if account_id in accounts_db:
-        account = accounts_db[account_id].copy()
-        # Mask sensitive information for security
-        account["balance"] = "***" if account["balance"] > 0 else "0"
+    account = accounts_db.get(account_id)
+    if account is None:
         return {
-            "success": True,
-            "account": account
+            "success": False,
+            "error": "Account not found"
         }
+    # Build the masked view directly instead of copying and mutating the record
     return {
-        "success": False,
-        "error": "Account not found"
+        "success": True,
+        "account": {
+            "name": account["name"],
+            "status": account["status"],
+            "balance": "***" if account["balance"] > 0 else "0"
+        }
     }
 
-@action()
-async def check_compliance(message: str = None, bot_response: str = None) -> Dict:
-    """Check if the message complies with financial regulations."""
-    # Support both parameter names for backward compatibility
-    text_to_check = bot_response or message or ""
-    
-    compliance_issues = []
-    
+@functools.lru_cache(maxsize=2048)
+def _check_compliance_sync(text_to_check: str) -> Dict:
+    """Pure compliance logic, memoized - flows re-check the same text per turn."""
+    hits = _scan_message(text_to_check)
+
     # Check for sensitive financial terms
-    sensitive_terms = ["credit card", "ssn", "social security", "password", "pin"]
-    for term in sensitive_terms:
-        if term.lower() in text_to_check.lower():
-            compliance_issues.append(f"Contains sensitive term: {term}")
-    
+    matched_terms = {hit.lower() for hit in hits.get("sensitive_term", ())}
+    compliance_issues = [
+        f"Contains sensitive term: {term}"
+        for term in _SENSITIVE_TERMS if term in matched_terms
+    ]
+
     # Check for investment advice (requires disclaimers)
-    investment_terms = ["invest", "stock", "bond", "portfolio", "return"]
-    has_investment_advice = any(term in text_to_check.lower() for term in investment_terms)
-    
+    has_investment_advice = "investment" in hits
+
     # Generate appropriate disclaimer
     disclaimer = ""
     if has_investment_advice:
         disclaimer = "\n\nDisclaimer: This information is for educational purposes only and should not be considered as financial advice. Please consult with a qualified financial advisor before making investment decisions."
-    
+
     return {
         "is_compliant": len(compliance_issues) == 0,
         "compliant": len(compliance_issues) == 0,  # Keep both for compatibility
@@ -272,186 +657,149 @@ async def check_compliance(message: str = None, bot_response: str = None) -> Dic
         "disclaimer": disclaimer
     }
 
+# Inputs longer than this get scanned on a worker thread so a multi-KB paste
+# can't stall the event loop; short messages skip the thread-hop overhead
+_TO_THREAD_THRESHOLD = 1024
+
+@action()
+async def check_compliance(message: str = None, bot_response: str = None) -> Dict:
+    """Check if the message complies with financial regulations."""
+    # Support both parameter names for backward compatibility. The scan is
+    # case-insensitive and the result never echoes the raw text, so the
+    # memo key is normalized - retries and re-worded-whitespace repeats of
+    # the same message hit the cache instead of rescanning.
+    text_to_check = (bot_response or message or "").strip().lower()
+    if len(text_to_check) > _TO_THREAD_THRESHOLD:
+        return _fresh(await asyncio.to_thread(_check_compliance_sync, text_to_check))
+    return _fresh(_check_compliance_sync(text_to_check))
+
+# is_compliant_fast only needs a boolean, so search() stops at the first
+# sensitive-term hit instead of enumerating every issue
+@action()
+async def is_compliant_fast(text_to_check: str) -> Dict:
+    """Boolean-only compliance gate for flows that just branch on the result.
+
+    check_compliance stays as the slow path that enumerates issues and builds
+    disclaimers for the logging/audit flows.
+    """
+    return {"is_compliant": _SENSITIVE_TERM_RE.search(text_to_check) is None}
+
 @action()
 async def get_grievance_status(grievance_id: str) -> Dict:
     """Get the status of a specific grievance."""
-    for grievance in grievances_db:
-        if grievance["id"] == grievance_id:
-            return {
-                "success": True,
-                "grievance": grievance
-            }
+    grievance = grievances_db.get(grievance_id)
+    if grievance is None:
+        return {
+            "success": False,
+            "error": "Grievance not found"
+        }
     return {
-        "success": False,
-        "error": "Grievance not found"
+        "success": True,
+        "grievance": grievance
     }
 
 @action()
 async def escalate_grievance(grievance_id: str, reason: str) -> Dict:
     """Escalate a grievance to higher priority."""
-    for grievance in grievances_db:
-        if grievance["id"] == grievance_id:
-            grievance["priority"] = "high"
-            grievance["escalation_reason"] = reason
-            grievance["escalated_at"] = datetime.now().isoformat()
-            return {
-                "success": True,
-                "message": f"Grievance {grievance_id} escalated successfully"
-            }
+    grievance = grievances_db.get(grievance_id)
+    if grievance is None:
+        return {
+            "success": False,
+            "error": "Grievance not found"
+        }
+    grievance["priority"] = "high"
+    grievance["escalation_reason"] = reason
+    grievance["escalated_at"] = datetime.now().isoformat()
     return {
-        "success": False,
-        "error": "Grievance not found"
+        "success": True,
+        "message": f"Grievance {grievance_id} escalated successfully"
     }
 
 @action()
 async def calculate_response_time(grievance_id: str) -> Dict:
     """Calculate the response time for a grievance."""
-    for grievance in grievances_db:
-        if grievance["id"] == grievance_id:
-            created_time = datetime.fromisoformat(grievance["created_at"])
-            current_time = datetime.now()
-            response_time = (current_time - created_time).total_seconds() / 3600  # hours
-            
-            return {
-                "success": True,
-                "response_time_hours": round(response_time, 2),
-                "within_sla": response_time <= 24  # 24-hour SLA
-            }
+    grievance = grievances_db.get(grievance_id)
+    if grievance is None:
+        return {
+            "success": False,
+            "error": "Grievance not found"
+        }
+    # Float subtraction on the stored epoch avoids reparsing the ISO string
+    response_time = (time.time() - grievance["created_epoch"]) / 3600  # hours
+
     return {
-        "success": False,
-        "error": "Grievance not found"
+        "success": True,
+        "response_time_hours": round(response_time, 2),
+        "within_sla": response_time <= 24  # 24-hour SLA
     }
 
+# Just a few key patterns to catch obvious attempts - one compiled alternation
+# so detection is a single C-level scan with no lowercase copy per message
+_JAILBREAK_RE = re.compile(
+    r"ignore previous instructions|forget your role|you are no longer|"
+    r"pretend you are|system:|override|new instructions",
+    re.IGNORECASE,
+)
+
 @action()
 async def simple_jailbreak_check(user_message: str) -> Dict:
     """Simple pattern-based jailbreak detection."""
-    
-    # Just a few key patterns to catch obvious attempts
-    jailbreak_keywords = [
-        "ignore previous instructions",
-        "forget your role", 
-        "you are no longer",
-        "pretend you are",
-        "system:",
-        "override",
-        "new instructions"
-    ]
-    
-    user_lower = user_message.lower()
-    detected = any(keyword in user_lower for keyword in jailbreak_keywords)
-    
     return {
-        "is_jailbreak": detected,
+        "is_jailbreak": _JAILBREAK_RE.search(user_message) is not None,
         "message": user_message
     }
 
-@action()
-async def classify_user_intent(user_message: str) -> Dict:
-    """Classify the user's intent based on their message with NPCI service focus."""
-    user_message_lower = user_message.lower()
-    
-    # Off-topic/non-NPCI keywords (should be redirected)
-    # Using word boundaries to prevent false matches
-    import re
-    off_topic_patterns = [
-        r'\bllm\b', r'\bai\b', r'\bartificial intelligence\b', r'\bmachine learning\b', r'\bchatbot\b', 
-        r'\bweather\b', r'\bsports\b', r'\bpolitics\b', r'\bentertainment\b', r'\bpersonal life\b', 
-        r'\bphilosophy\b', r'\breligion\b', r'\bwhat is like to be\b', r'\bhow does it feel\b',
-        r'\byour experience\b', r'\byour thoughts\b', r'\byour opinion\b', r'\bloan\b', r'\bcredit card bill\b', 
-        r'\binvestment\b', r'\binsurance\b', r'\bmutual fund\b', r'\bstock\b', r'\bforex\b'
-    ]
-    
-    # UPI-related keywords
-    upi_keywords = ["upi", "unified payment", "payment failed", "money debited", "upi id", "upi pin", "phonepe", "gpay", "paytm", "bhim"]
-    
-    # RuPay-related keywords  
-    rupay_keywords = ["rupay", "debit card", "atm card", "card not working", "card declined", "card blocked"]
-    
-    # NACH/Mandate keywords
-    mandate_keywords = ["nach", "mandate", "auto debit", "emi", "autopay", "standing instruction", "si", "recurring payment"]
-    
-    # IMPS keywords
-    imps_keywords = ["imps", "immediate payment", "instant transfer", "money transfer", "beneficiary"]
-    
-    # NETC/FASTag keywords
-    netc_keywords = ["fastag", "netc", "toll", "toll payment", "blacklist", "recharge"]
-    
-    # BBPS keywords
-    bbps_keywords = ["bbps", "bill payment", "utility bill", "electricity bill", "water bill", "gas bill"]
-    
-    # General grievance/complaint keywords
-    grievance_keywords = ["complaint", "issue", "problem", "grievance", "dispute", "unhappy", "dissatisfied", "error", "failed", "not working"]
-    
-    # NPCI service inquiry keywords
-    npci_service_keywords = ["npci", "what is npci", "transaction limit", "service hours", "contact", "helpline", "support"]
-    
-    # Check for off-topic first (IMPORTANT: This goes first!)
-    if any(re.search(pattern, user_message_lower) for pattern in off_topic_patterns):
-        category = "off_topic"
-        confidence = 0.95
-    elif any(keyword in user_message_lower for keyword in upi_keywords):
-        category = "upi_related"
-        confidence = 0.9
-    elif any(keyword in user_message_lower for keyword in rupay_keywords):
-        category = "rupay_related"
-        confidence = 0.9
-    elif any(keyword in user_message_lower for keyword in mandate_keywords):
-        category = "mandate_related"
-        confidence = 0.9
-    elif any(keyword in user_message_lower for keyword in imps_keywords):
-        category = "imps_related"
-        confidence = 0.9
-    elif any(keyword in user_message_lower for keyword in netc_keywords):
-        category = "netc_related"
-        confidence = 0.9
-    elif any(keyword in user_message_lower for keyword in bbps_keywords):
-        category = "bbps_related"
-        confidence = 0.9
-    elif any(keyword in user_message_lower for keyword in grievance_keywords):
-        category = "general_grievance"
-        confidence = 0.8
-    elif any(keyword in user_message_lower for keyword in npci_service_keywords):
-        category = "npci_inquiry"
-        confidence = 0.8
+@functools.lru_cache(maxsize=4096)
+def _classify_intent_sync(user_message: str) -> Dict:
+    """Pure classification logic, memoized so repeated messages skip the scans."""
+    # Walk the categories in priority order and stop at the first hit
+    # (IMPORTANT: off-topic goes first!)
+    for pattern, category, confidence in _INTENT_PRIORITY:
+        if pattern.search(user_message):
+            break
     else:
         # If no clear category, assume general NPCI support
         category = "general_npci_support"
         confidence = 0.5  # Lower confidence for unclear messages
-    
+
     return {
         "category": category,
         "confidence": confidence,
         "message": user_message
     }
 
+@action()
+async def classify_user_intent(user_message: str) -> Dict:
+    """Classify the user's intent based on their message with NPCI service focus."""
+    return _fresh(_classify_intent_sync(user_message))
+
+# Off-topic redirect is identical for every message - build it once
+_OFF_TOPIC_REDIRECT = {
+    "response": "I'm NPCI Grievance Bot, specialized in helping with NPCI services like UPI, RuPay, NACH, IMPS, FASTag (NETC), and BBPS. I can assist you with payment issues, transaction problems, mandate management, and general NPCI service queries. How can I help you with your NPCI-related needs today?",
+    "redirect_successful": True
+}
+
 @action()
 async def handle_off_topic_request(user_message: str) -> Dict:
     """Handle off-topic requests by redirecting to NPCI services."""
-    return {
-        "response": "I'm NPCI Grievance Bot, specialized in helping with NPCI services like UPI, RuPay, NACH, IMPS, FASTag (NETC), and BBPS. I can assist you with payment issues, transaction problems, mandate management, and general NPCI service queries. How can I help you with your NPCI-related needs today?",
-        "redirect_successful": True
-    }
+    return _fresh(_OFF_TOPIC_REDIRECT)
 
-@action()
-async def validate_user_input(user_message: str) -> Dict:
-    """Validate user input for security and appropriateness."""
-    import re
-    
+@functools.lru_cache(maxsize=4096)
+def _validate_input_sync(user_message: str) -> Dict:
+    """Pure validation logic, memoized on the message string."""
+    hits = _scan_message(user_message)
     issues = []
-    
+
     # Check for credit card numbers (basic pattern)
-    cc_pattern = r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b'
-    if re.search(cc_pattern, user_message):
+    if "credit_card" in hits:
         issues.append("Contains potential credit card number")
-    
+
     # Check for SSN pattern
-    ssn_pattern = r'\b\d{3}-\d{2}-\d{4}\b'
-    if re.search(ssn_pattern, user_message):
+    if "ssn" in hits:
         issues.append("Contains potential SSN")
-    
+
     # Check for abusive language (basic check)
-    abusive_words = ["damn", "hell", "stupid", "idiot", "hate"]
-    if any(word in user_message.lower() for word in abusive_words):
+    if "abusive" in hits:
         issues.append("Contains inappropriate language")
     
     return {
@@ -461,22 +809,18 @@ async def validate_user_input(user_message: str) -> Dict:
     }
 
 @action()
-async def check_for_sensitive_info(user_message: str) -> Dict:
-    """Check for sensitive information in user message."""
-    import re
-    
-    sensitive_patterns = {
-        "credit_card": r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b',
-        "ssn": r'\b\d{3}-\d{2}-\d{4}\b',
-        "phone": r'\b\d{3}-\d{3}-\d{4}\b',
-        "email": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    }
-    
-    detected_types = []
-    for info_type, pattern in sensitive_patterns.items():
-        if re.search(pattern, user_message):
-            detected_types.append(info_type)
-    
+async def validate_user_input(user_message: str) -> Dict:
+    """Validate user input for security and appropriateness."""
+    if len(user_message) > _TO_THREAD_THRESHOLD:
+        return _fresh(await asyncio.to_thread(_validate_input_sync, user_message))
+    return _fresh(_validate_input_sync(user_message))
+
+@functools.lru_cache(maxsize=4096)
+def _sensitive_info_sync(user_message: str) -> Dict:
+    """Pure sensitive-data scan, memoized on the message string."""
+    hits = _scan_message(user_message)
+    detected_types = [info_type for info_type, _ in _SENSITIVE_PATTERNS if info_type in hits]
+
     return {
         "contains_sensitive_data": len(detected_types) > 0,
         "detected_types": detected_types,
@@ -484,17 +828,52 @@ async def check_for_sensitive_info(user_message: str) -> Dict:
     }
 
 @action()
-async def check_response_quality(bot_response: str) -> Dict:
-    """Check the quality of bot response."""
+async def check_for_sensitive_info(user_message: str) -> Dict:
+    """Check for sensitive information in user message."""
+    if len(user_message) > _TO_THREAD_THRESHOLD:
+        return _fresh(await asyncio.to_thread(_sensitive_info_sync, user_message))
+    return _fresh(_sensitive_info_sync(user_message))
+
+@action()
+async def moderate_turn(user_message: str) -> Dict:
+    """Run the independent per-turn moderation checks concurrently.
+
+    The local CPU-bound checks complete inside the Llama Guard network wait,
+    so the fused rail costs roughly the guard latency alone instead of the
+    sum of all four checks run back to back.
+    """
+    safety, compliance, validation, sensitive = await asyncio.gather(
+        llama_guard_with_fallback(user_message),
+        check_compliance(message=user_message),
+        validate_user_input(user_message),
+        check_for_sensitive_info(user_message),
+    )
+
+    return {
+        "is_safe": safety["is_safe"],
+        "is_valid": validation["is_valid"],
+        "is_compliant": compliance["is_compliant"],
+        "contains_sensitive_data": sensitive["contains_sensitive_data"],
+        "safety": safety,
+        "compliance": compliance,
+        "validation": validation,
+        "sensitive": sensitive,
+    }
+
+@functools.lru_cache(maxsize=4096)
+def _response_quality_sync(bot_response: str) -> Dict:
+    """Pure response-quality checks, memoized on the response string."""
     issues = []
     
     # Check minimum length
     if len(bot_response) < 10:
         issues.append("Response too short")
     
-    # Check for professional tone indicators
-    professional_indicators = ["please", "thank you", "apologize", "understand", "assist", "help"]
-    if not any(indicator in bot_response.lower() for indicator in professional_indicators):
+    # Check for professional tone indicators - tokenize once and intersect
+    # with the indicator set instead of K substring scans ("helpless" should
+    # not count as "help")
+    tokens = frozenset(_WORD_RE.findall(bot_response.lower()))
+    if not tokens & _PROFESSIONAL_TOKENS:
         issues.append("May lack professional tone")
     
     # Check for complete sentences
@@ -507,6 +886,11 @@ async def check_response_quality(bot_response: str) -> Dict:
         "response": bot_response
     }
 
+@action()
+async def check_response_quality(bot_response: str) -> Dict:
+    """Check the quality of bot response."""
+    return _fresh(_response_quality_sync(bot_response))
+
 @action()
 async def improve_response_quality(original_response: str, quality_issues: List[str]) -> Dict:
     """Improve response quality based on identified issues."""
@@ -529,47 +913,55 @@ async def improve_response_quality(original_response: str, quality_issues: List[
 @action()
 async def format_bot_response(response: str, user_context: Optional[Dict] = None) -> Dict:
     """Format bot response for consistency and professionalism."""
-    # Ensure proper capitalization
-    formatted_response = response.strip()
-    if formatted_response and not formatted_response[0].isupper():
-        formatted_response = formatted_response[0].upper() + formatted_response[1:]
-    
-    # Handle user_context safely - it might be a string or None from Colang
-    context_dict = {}
-    if user_context and isinstance(user_context, dict):
-        context_dict = user_context
-    
+    # Strip only when there is whitespace to trim, and capitalize only when
+    # the first char isn't already uppercase - LLM output usually is, so the
+    # common case allocates nothing
+    formatted_response = response or ""
+    if formatted_response[:1].isspace() or formatted_response[-1:].isspace():
+        formatted_response = formatted_response.strip()
+    first = formatted_response[:1]
+    if first and not first.isupper():
+        formatted_response = first.upper() + formatted_response[1:]
+
     # Add professional greeting if this is the start of conversation
-    if context_dict.get("is_first_message", False):
+    # (user_context might be a string or None from Colang)
+    if isinstance(user_context, dict) and user_context.get("is_first_message", False):
         formatted_response = f"Hello! {formatted_response}"
-    
+
     return {
         "content": formatted_response
     }
 
+# Static templates and keyword groups for general inquiries - built once at
+# import instead of on every call
+_GENERAL_RESPONSE_TEMPLATES = {
+    "hours": "NPCI customer support operates through participating banks and service providers. For UPI issues, contact your bank's customer service. For general NPCI queries, visit npci.org.in or call the NPCI helpline.",
+    "fees": "NPCI services like UPI are generally free for person-to-person transactions. Merchant transaction fees vary by bank and payment method. Check with your bank for specific fee structures.",
+    "contact": "For NPCI-related issues: Visit npci.org.in, contact your bank's customer service, or reach out to your payment app provider. Each NPCI service has dedicated support channels.",
+    "upi_limits": "UPI transaction limits: ₹1 lakh per transaction for P2P, ₹2 lakh for P2M. Daily limits may vary by bank. Check with your bank for specific limits.",
+    "default": "Thank you for your NPCI-related inquiry. I can help with UPI, RuPay, NACH, IMPS, FASTag, and BBPS issues. Could you please specify which NPCI service you need assistance with?"
+}
+
+_HOURS_KWS = ("hours", "time", "when", "support")
+_FEES_KWS = ("fee", "charge", "cost", "price")
+_CONTACT_KWS = ("contact", "phone", "call", "reach", "helpline")
+_LIMITS_KWS = ("limit", "maximum", "daily", "transaction limit")
+
 @action()
 async def process_general_inquiry(user_message: str, user_context: Optional[Dict] = None) -> Dict:
     """Process general NPCI service inquiries."""
-    response_templates = {
-        "hours": "NPCI customer support operates through participating banks and service providers. For UPI issues, contact your bank's customer service. For general NPCI queries, visit npci.org.in or call the NPCI helpline.",
-        "fees": "NPCI services like UPI are generally free for person-to-person transactions. Merchant transaction fees vary by bank and payment method. Check with your bank for specific fee structures.",
-        "contact": "For NPCI-related issues: Visit npci.org.in, contact your bank's customer service, or reach out to your payment app provider. Each NPCI service has dedicated support channels.",
-        "upi_limits": "UPI transaction limits: ₹1 lakh per transaction for P2P, ₹2 lakh for P2M. Daily limits may vary by bank. Check with your bank for specific limits.",
-        "default": "Thank you for your NPCI-related inquiry. I can help with UPI, RuPay, NACH, IMPS, FASTag, and BBPS issues. Could you please specify which NPCI service you need assistance with?"
-    }
-    
     user_message_lower = user_message.lower()
-    
-    if any(word in user_message_lower for word in ["hours", "time", "when", "support"]):
-        response = response_templates["hours"]
-    elif any(word in user_message_lower for word in ["fee", "charge", "cost", "price"]):
-        response = response_templates["fees"]
-    elif any(word in user_message_lower for word in ["contact", "phone", "call", "reach", "helpline"]):
-        response = response_templates["contact"]
-    elif any(word in user_message_lower for word in ["limit", "maximum", "daily", "transaction limit"]):
-        response = response_templates["upi_limits"]
+
+    if any(word in user_message_lower for word in _HOURS_KWS):
+        response = _GENERAL_RESPONSE_TEMPLATES["hours"]
+    elif any(word in user_message_lower for word in _FEES_KWS):
+        response = _GENERAL_RESPONSE_TEMPLATES["fees"]
+    elif any(word in user_message_lower for word in _CONTACT_KWS):
+        response = _GENERAL_RESPONSE_TEMPLATES["contact"]
+    elif any(word in user_message_lower for word in _LIMITS_KWS):
+        response = _GENERAL_RESPONSE_TEMPLATES["upi_limits"]
     else:
-        response = response_templates["default"]
+        response = _GENERAL_RESPONSE_TEMPLATES["default"]
     
     return {
         "message": response,
@@ -578,10 +970,9 @@ async def process_general_inquiry(user_message: str, user_context: Optional[Dict
 
 # NPCI-Specific Actions
 
-@action()
-async def handle_upi_grievance(issue_type: str, transaction_ref: str = "", description: str = "") -> Dict:
-    """Handle UPI-specific grievances and provide resolution guidance."""
-    upi_resolution_steps = {
+# Static resolution guidance - precomputed into complete response payloads at
+# import so the common inquiry (no transaction reference) is one dict lookup
+_UPI_RESOLUTION_STEPS = {
         "failed_transaction": {
             "steps": [
                 "Check if money was debited from your account",
@@ -616,30 +1007,40 @@ async def handle_upi_grievance(issue_type: str, transaction_ref: str = "", descr
             "escalation": "Contact bank if UPI ID registration fails"
         }
     }
-    
-    resolution = upi_resolution_steps.get(issue_type, upi_resolution_steps["failed_transaction"])
-    
-    # Format steps with transaction reference if provided
-    formatted_steps = []
-    for step in resolution["steps"]:
-        if "{transaction_ref}" in step and transaction_ref:
-            formatted_steps.append(step.format(transaction_ref=transaction_ref))
-        else:
-            formatted_steps.append(step)
-    
-    return {
-        "resolution_steps": formatted_steps,
+
+_UPI_RESPONSES = {
+    issue_type: {
+        "resolution_steps": resolution["steps"],
         "timeline": resolution["timeline"],
         "escalation_path": resolution["escalation"],
         "service_type": "UPI",
         "issue_category": issue_type,
-        "reference_id": transaction_ref
+        "reference_id": ""
     }
+    for issue_type, resolution in _UPI_RESOLUTION_STEPS.items()
+}
 
 @action()
-async def handle_mandate_issues(mandate_type: str, issue_description: str = "") -> Dict:
-    """Handle NPCI mandate-related issues (e-NACH, UPI AutoPay, etc.)."""
-    mandate_solutions = {
+async def handle_upi_grievance(issue_type: str, transaction_ref: str = "", description: str = "") -> Dict:
+    """Handle UPI-specific grievances and provide resolution guidance."""
+    known_type = issue_type if issue_type in _UPI_RESPONSES else "failed_transaction"
+    response = _fresh(_UPI_RESPONSES[known_type])
+    response["issue_category"] = issue_type
+
+    # Common inquiry path: no reference to substitute
+    if not transaction_ref:
+        return response
+
+    # Format steps with the provided transaction reference
+    response["resolution_steps"] = [
+        step.format(transaction_ref=transaction_ref) if "{transaction_ref}" in step else step
+        for step in _UPI_RESOLUTION_STEPS[known_type]["steps"]
+    ]
+    response["reference_id"] = transaction_ref
+    return response
+
+# Mandate guidance is fully static per mandate type
+_MANDATE_SOLUTIONS = {
         "e_NACH": {
             "common_issues": {
                 "mandate_rejection": "Verify bank account details, ensure sufficient balance, check signature match",
@@ -665,21 +1066,31 @@ async def handle_mandate_issues(mandate_type: str, issue_description: str = "")
             "contact_info": "Contact your bank's customer service for Standing Instruction issues"
         }
     }
-    
-    mandate_info = mandate_solutions.get(mandate_type, mandate_solutions["e_NACH"])
-    
-    return {
+
+_MANDATE_RESPONSES = {
+    mandate_type: {
         "mandate_type": mandate_type,
         "common_solutions": mandate_info["common_issues"],
         "contact_support": mandate_info["contact_info"],
         "general_advice": "Always keep mandate confirmation receipts and monitor account statements regularly",
         "escalation": "File complaint with RBI Banking Ombudsman if bank doesn't resolve within 30 days"
     }
+    for mandate_type, mandate_info in _MANDATE_SOLUTIONS.items()
+}
 
 @action()
-async def provide_npci_faq(query_type: str) -> Dict:
-    """Provide answers to frequently asked questions about NPCI services."""
-    npci_faqs = {
+async def handle_mandate_issues(mandate_type: str, issue_description: str = "") -> Dict:
+    """Handle NPCI mandate-related issues (e-NACH, UPI AutoPay, etc.)."""
+    base = _MANDATE_RESPONSES.get(mandate_type)
+    if base is not None:
+        return _fresh(base)
+    # Unknown types fall back to e-NACH guidance but echo the requested type
+    response = _fresh(_MANDATE_RESPONSES["e_NACH"])
+    response["mandate_type"] = mandate_type
+    return response
+
+# FAQ payloads precomputed per query type
+_NPCI_FAQS = {
         "what_is_npci": {
             "answer": "National Payments Corporation of India (NPCI) is the umbrella organization for operating retail payments and settlement systems in India. It operates UPI, RuPay, NACH, IMPS, and other digital payment systems.",
             "services": ["UPI", "RuPay", "NACH", "IMPS", "NETC (FASTag)", "BBPS", "NFS", "RuPay Credit Cards"]
@@ -706,16 +1117,33 @@ async def provide_npci_faq(query_type: str) -> Dict:
             "steps": ["Check account statement", "Note transaction reference ID", "Contact bank customer service", "Wait for auto-reversal (T+1)", "Escalate if not resolved in 7 days"]
         }
     }
-    
-    faq_response = npci_faqs.get(query_type, {
-        "answer": "For specific NPCI service queries, please visit npci.org.in or contact your bank's customer service.",
-        "additional_info": "You can also reach out to your payment app's customer support for service-specific issues."
-    })
-    
-    return {
+
+_NPCI_FAQ_DEFAULT = {
+    "answer": "For specific NPCI service queries, please visit npci.org.in or contact your bank's customer service.",
+    "additional_info": "You can also reach out to your payment app's customer support for service-specific issues."
+}
+
+_NPCI_FAQ_RESPONSES = {
+    query_type: {
         "query_type": query_type,
         "answer": faq_response.get("answer", ""),
         "additional_details": faq_response,
         "official_website": "https://www.npci.org.in",
         "customer_portal": "https://www.npci.org.in/grievance-portal"
+    }
+    for query_type, faq_response in _NPCI_FAQS.items()
+}
+
+@action()
+async def provide_npci_faq(query_type: str) -> Dict:
+    """Provide answers to frequently asked questions about NPCI services."""
+    response = _NPCI_FAQ_RESPONSES.get(query_type)
+    if response is not None:
+        return _fresh(response)
+    return {
+        "query_type": query_type,
+        "answer": _NPCI_FAQ_DEFAULT["answer"],
+        "additional_details": _fresh(_NPCI_FAQ_DEFAULT),
+        "official_website": "https://www.npci.org.in",
+        "customer_portal": "https://www.npci.org.in/grievance-portal"
     }
\ No newline at end of file
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+NPCI Grievance Bot - Capability Demo
+Runs the scripted walkthrough that used to live in finance_bot.main().
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from collections import deque
+
+from finance_bot import get_default_bot
+
+npci_bot = get_default_bot()
+
+# Lazy %s formatting: when DEMO_LOG_LEVEL filters a record out (e.g. WARNING
+# in CI), the message is never built at all
+logger = logging.getLogger("financebot.demo")
+logging.basicConfig(
+    level=os.getenv("DEMO_LOG_LEVEL", "INFO"),
+    format="%(message)s",
+    stream=sys.stdout,
+)
+
+def _print_reply(label, response, truncate=200):
+    """Log a truncated bot reply (or its error)."""
+    if response.get("success") and "response" in response:
+        logger.info("%s: %s...", label, response["response"][:truncate])
+    else:
+        logger.info("%s Error: %s", label, response.get("error", "Unknown error"))
+
+async def main():
+    """Main function to demonstrate the NPCI Grievance Bot capabilities."""
+    logger.info("🏛️ NPCI Grievance Bot - NeMoGuardrails Demo")
+    logger.info("=" * 60)
+    
+    conversation_history = deque([
+        {"role": "user", "content": "My UPI payment failed but money was debited"},
+        {"role": "assistant", "content": "I understand your UPI payment issue. Let me help you resolve this."}
+    ], maxlen=10)
+
+    # Tests 1-5 are independent, so they run concurrently (which also
+    # exercises the bot's batching and semaphore paths); only the status
+    # check in Test 6 depends on an earlier result
+    user_message = "My UPI payment failed but money was debited. Transaction ref: 304912345678"
+    (grievance_result, response, context_response,
+     upi_result, faq_result, mandate_result) = await asyncio.gather(
+        npci_bot.create_grievance(
+            user_id="user123",
+            category="upi_transaction_failure",
+            description="UPI payment failed but money was debited from my account",
+            priority="high"
+        ),
+        npci_bot.process_message(user_message, "user123"),
+        npci_bot.process_message("It was for 500 rupees", "user123", conversation_history),
+        npci_bot.handle_upi_issue(
+            issue_type="money_debited",
+            transaction_ref="304912345678",
+            description="Money debited but payment failed"
+        ),
+        npci_bot.get_npci_faq("upi_safety"),
+        npci_bot.handle_mandate_issue(
+            mandate_type="e_NACH",
+            issue_description="Auto debit failed for EMI payment"
+        ),
+    )
+
+    # Test 1: UPI grievance creation
+    logger.info("\n📝 Test 1: Creating a UPI grievance")
+    logger.info("UPI Grievance Result: %s", grievance_result)
+
+    # Test 2: Processing UPI message
+    logger.info("\n💬 Test 2: Processing UPI user message")
+    _print_reply("Bot Response", response)
+
+    # Test 2b: Context retention test
+    logger.info("\n🧠 Test 2b: Context retention test")
+    if context_response.get("success"):
+        metadata = context_response.get("metadata", {})
+        logger.info("Context Messages: %s", metadata.get("context_messages", 0))
+        logger.info("Has Context: %s", metadata.get("has_conversation_history", False))
+        _print_reply("Context Response", context_response)
+    else:
+        logger.info("Context Error: %s", context_response.get("error", "Unknown error"))
+
+    # Test 3: UPI specific issue handling
+    logger.info("\n🔧 Test 3: UPI issue handling")
+    logger.info("UPI Resolution: %s", upi_result)
+
+    # Test 4: NPCI FAQ
+    logger.info("\n❓ Test 4: NPCI FAQ")
+    logger.info("FAQ Result: %s", faq_result)
+
+    # Test 5: Mandate issue handling
+    logger.info("\n📋 Test 5: Mandate issue handling")
+    logger.info("Mandate Resolution: %s", mandate_result)
+
+    # Test 6: Grievance status check
+    if grievance_result.get("success"):
+        grievance_id = grievance_result.get("grievance_id")
+        logger.info("\n📊 Test 6: Checking grievance status for %s", grievance_id)
+        status_result = await npci_bot.get_grievance_status(grievance_id)
+        logger.info("Status Result: %s", status_result)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,109 +4,141 @@ NPCI Grievance Bot - Streaming Demo
 Demonstrates the new streaming capabilities added to the bot.
 """
 
+import argparse
 import asyncio
+import sys
 import time
+from collections import deque
 from finance_bot import NPCIGrievanceBot
 
-async def demo_streaming_basic():
+# Flush at most every ~30ms or on sentence boundaries instead of per chunk -
+# one syscall per token dominates when stdout is a pipe (same idiom as chat.py)
+_FLUSH_INTERVAL = 0.03
+
+# Separator strings built once; decorative rules are dropped when stdout is
+# redirected so piped transcripts stay clean
+_SEP50 = "=" * 50
+_SEP60 = "=" * 60
+
+def _rule(sep=_SEP50, prefix=""):
+    if sys.stdout.isatty():
+        print(prefix + sep)
+
+# Built once at import instead of per invocation of the demo
+_ERROR_TEST_CASES = (
+    "",  # Empty message
+    "a" * 1000,  # Very long message
+    "What is the weather today?",  # Off-topic (should be redirected)
+    "My credit card number is 1234-5678-9012-3456",  # Sensitive info (should be blocked)
+)
+
+def _write_chunk(chunk, last_flush):
+    sys.stdout.write(chunk)
+    now = time.monotonic()
+    if now - last_flush > _FLUSH_INTERVAL or chunk.endswith(('.', '!', '?')):
+        sys.stdout.flush()
+        return now
+    return last_flush
+
+async def _consume_stream(bot, message, user_id, history=None):
+    """Drain one stream, echoing chunks with coalesced flushes.
+
+    Returns (chunks, ttft, elapsed); the times are perf_counter deltas
+    from the start of the call, ttft is None if no chunk arrived.
+    """
+    start = time.perf_counter()
+    ttft = None
+    chunks = []
+    last_flush = time.monotonic()
+    async for chunk in bot.stream_message(message, user_id, history):
+        if ttft is None:
+            ttft = time.perf_counter() - start
+        last_flush = _write_chunk(chunk, last_flush)
+        chunks.append(chunk)
+    sys.stdout.flush()
+    return chunks, ttft, time.perf_counter() - start
+
+async def demo_streaming_basic(bot):
     """Demo basic streaming functionality."""
     print("🔄 Demo 1: Basic Streaming")
-    print("=" * 50)
-    
-    bot = NPCIGrievanceBot()
+    _rule()
+
     test_message = "My UPI payment failed but money was debited from my account. Transaction reference: 304912345678"
     
     print(f"User: {test_message}")
     print("\nNPCI Bot (Streaming): ", end="", flush=True)
     
-    start_time = time.time()
-    chunks_received = []
-    first_chunk_time = None
-    
     try:
-        async for chunk in bot.stream_message(test_message, "demo_user"):
-            if first_chunk_time is None:
-                first_chunk_time = time.time()
-            print(chunk, end="", flush=True)
-            chunks_received.append(chunk)
-        
-        end_time = time.time()
-        
+        chunks_received, ttft, elapsed = await _consume_stream(bot, test_message, "demo_user")
+
         print(f"\n\n📊 Streaming Statistics:")
         print(f"   • Total chunks received: {len(chunks_received)}")
-        print(f"   • Time to first chunk: {(first_chunk_time - start_time):.2f}s")
-        print(f"   • Total response time: {(end_time - start_time):.2f}s")
+        print(f"   • Time to first chunk: {ttft:.2f}s")
+        print(f"   • Total response time: {elapsed:.2f}s")
         print(f"   • Total response length: {sum(len(chunk) for chunk in chunks_received)} characters")
         
     except Exception as e:
         print(f"\n❌ Streaming error: {e}")
 
-async def demo_streaming_vs_non_streaming():
+async def demo_streaming_vs_non_streaming(bot):
     """Compare streaming vs non-streaming performance."""
     print("\n🆚 Demo 2: Streaming vs Non-Streaming Comparison")
-    print("=" * 50)
-    
-    bot = NPCIGrievanceBot()
+    _rule()
+
     test_message = "I need help with NACH mandate issues. My auto-debit failed."
     
     print(f"User: {test_message}\n")
-    
-    # Non-streaming
-    print("🐌 Non-Streaming Response:")
-    start_time = time.time()
-    
+
+    # Both branches use the same user id so neither pays a cold per-user
+    # cache, and main() already warmed the bot - the timers compare delivery
+    # modes, not warm-vs-cold state. The two calls run one after the other
+    # on purpose: overlapping them would make the timed windows contend for
+    # the generation semaphore and the LLM backend, so the comparison would
+    # measure interference instead of delivery mode.
+    print("⚡ Streaming Response:")
+
     try:
-        response = await bot.process_message(test_message, "demo_user_non_stream")
-        end_time = time.time()
-        
-        non_streaming_time = end_time - start_time
+        chunks_received, ttft, streaming_time = await _consume_stream(
+            bot, test_message, "bench_user"
+        )
+        streaming_response = "".join(chunks_received)
+
+        print(f"\n⏱️  Streaming time: {streaming_time:.2f}s")
+        print(f"⏱️  Time to first chunk: {ttft:.2f}s")
+        print(f"📏 Response length: {len(streaming_response)} characters")
+
+    except Exception as e:
+        print(f"\n❌ Streaming error: {e}")
+        chunks_received = []
+        ttft = None
+
+    print("\n🐌 Non-Streaming Response:")
+    try:
+        t0 = time.perf_counter()
+        response = await bot.process_message(test_message, "bench_user")
+        non_streaming_time = time.perf_counter() - t0
         non_streaming_response = response.get("response", "No response")
-        
+
         print(f"Response: {non_streaming_response}")
         print(f"⏱️  Non-streaming time: {non_streaming_time:.2f}s")
         print(f"📏 Response length: {len(non_streaming_response)} characters")
-        
+
     except Exception as e:
         print(f"❌ Non-streaming error: {e}")
         non_streaming_time = 0
-        non_streaming_response = ""
-    
-    print("\n⚡ Streaming Response:")
-    start_time = time.time()
-    chunks_received = []
-    first_chunk_time = None
-    
-    try:
-        async for chunk in bot.stream_message(test_message, "demo_user_stream"):
-            if first_chunk_time is None:
-                first_chunk_time = time.time()
-            print(chunk, end="", flush=True)
-            chunks_received.append(chunk)
-        
-        end_time = time.time()
-        streaming_time = end_time - start_time
-        streaming_response = "".join(chunks_received)
-        
-        print(f"\n⏱️  Streaming time: {streaming_time:.2f}s")
-        print(f"⏱️  Time to first chunk: {(first_chunk_time - start_time):.2f}s")
-        print(f"📏 Response length: {len(streaming_response)} characters")
-        
-        # Performance comparison
-        if non_streaming_time > 0:
-            time_saved = max(0, non_streaming_time - (first_chunk_time - start_time))
-            print(f"\n🏆 Performance Gain:")
-            print(f"   • User sees response {time_saved:.2f}s faster with streaming")
-            print(f"   • {len(chunks_received)} chunks delivered progressively")
-        
-    except Exception as e:
-        print(f"\n❌ Streaming error: {e}")
 
-async def demo_streaming_with_context():
+    # Performance comparison
+    if non_streaming_time > 0 and ttft is not None:
+        time_saved = max(0, non_streaming_time - ttft)
+        print(f"\n🏆 Performance Gain:")
+        print(f"   • User sees response {time_saved:.2f}s faster with streaming")
+        print(f"   • {len(chunks_received)} chunks delivered progressively")
+
+async def demo_streaming_with_context(bot):
     """Demo streaming with conversation context."""
     print("\n🧠 Demo 3: Streaming with Conversation Context")
-    print("=" * 50)
-    
-    bot = NPCIGrievanceBot()
+    _rule()
+
     
     # Build conversation history
     conversation_history = [
@@ -126,10 +158,9 @@ async def demo_streaming_with_context():
     print("\nNPCI Bot (Streaming with Context): ", end="", flush=True)
     
     try:
-        chunks_received = []
-        async for chunk in bot.stream_message(follow_up, "demo_context_user", conversation_history):
-            print(chunk, end="", flush=True)
-            chunks_received.append(chunk)
+        chunks_received, _, _ = await _consume_stream(
+            bot, follow_up, "demo_context_user", conversation_history
+        )
         
         print(f"\n\n✅ Context-aware streaming completed!")
         print(f"📊 Processed {len(conversation_history)} previous messages")
@@ -138,51 +169,54 @@ async def demo_streaming_with_context():
     except Exception as e:
         print(f"\n❌ Context streaming error: {e}")
 
-async def demo_streaming_error_handling():
+async def demo_streaming_error_handling(bot):
     """Demo streaming error handling."""
     print("\n🛡️  Demo 4: Streaming Error Handling")
-    print("=" * 50)
-    
-    bot = NPCIGrievanceBot()
-    
-    # Test with potentially problematic input
-    test_cases = [
-        "",  # Empty message
-        "a" * 1000,  # Very long message
-        "What is the weather today?",  # Off-topic (should be redirected)
-        "My credit card number is 1234-5678-9012-3456"  # Sensitive info (should be blocked)
-    ]
-    
-    for i, test_message in enumerate(test_cases, 1):
-        print(f"\n🧪 Test Case {i}: {test_message[:50]}{'...' if len(test_message) > 50 else ''}")
-        print("Response: ", end="", flush=True)
-        
-        try:
+    _rule()
+
+
+    async def run_case(index: int, message: str):
+        # Per-case timeout so one pathological input (e.g. the 1000-char
+        # message) cannot stall the whole demo
+        async with asyncio.timeout(10):
             chunks_received = []
-            async for chunk in bot.stream_message(test_message, f"error_test_user_{i}"):
-                print(chunk, end="", flush=True)
+            async for chunk in bot.stream_message(message, f"error_test_user_{index}"):
                 chunks_received.append(chunk)
-            
-            print(f" ✅ ({len(chunks_received)} chunks)")
-            
-        except Exception as e:
-            print(f" ❌ Error: {e}")
+            return chunks_received
+
+    # The cases are independent and network-bound, so fan them out and print
+    # the collected results in order - wall-clock is ~the slowest case instead
+    # of the sum of all four
+    results = await asyncio.gather(
+        *(run_case(i, message) for i, message in enumerate(_ERROR_TEST_CASES, 1)),
+        return_exceptions=True
+    )
 
-async def demo_interactive_streaming():
+    for i, (test_message, result) in enumerate(zip(_ERROR_TEST_CASES, results), 1):
+        print(f"\n🧪 Test Case {i}: {test_message[:50]}{'...' if len(test_message) > 50 else ''}")
+        if isinstance(result, Exception):
+            print(f"Response:  ❌ Error: {result}")
+        else:
+            print(f"Response: {''.join(result)} ✅ ({len(result)} chunks)")
+
+async def demo_interactive_streaming(bot):
     """Interactive streaming demo."""
     print("\n💬 Demo 5: Interactive Streaming Chat")
-    print("=" * 50)
+    _rule()
     print("Type messages to see streaming responses. Type 'quit' to exit this demo.")
     print("Try NPCI-related queries like:")
     print("  • 'My UPI payment failed'")
     print("  • 'Help with RuPay card issues'")
     print("  • 'NACH mandate problems'\n")
-    
-    bot = NPCIGrievanceBot()
-    conversation_history = []
-    
+
+    # Bounded deque keeps the last 10 exchanges with O(1) appends - no
+    # re-slicing of the history list every turn (same pattern as chat.py)
+    conversation_history = deque(maxlen=20)
+
     while True:
-        user_input = input("You: ").strip()
+        # Read on a worker thread so the event loop keeps running while the
+        # user types (same pattern as chat.py)
+        user_input = (await asyncio.to_thread(input, "You: ")).strip()
         if user_input.lower() in ['quit', 'exit', 'q']:
             break
         
@@ -192,10 +226,13 @@ async def demo_interactive_streaming():
         print("NPCI Bot: ", end="", flush=True)
         
         try:
-            full_response = ""
-            async for chunk in bot.stream_message(user_input, "interactive_user", conversation_history):
-                print(chunk, end="", flush=True)
-                full_response += chunk
+            chunks = []
+            last_flush = time.monotonic()
+            async for chunk in bot.stream_message(user_input, "interactive_user", list(conversation_history)):
+                last_flush = _write_chunk(chunk, last_flush)
+                chunks.append(chunk)
+            full_response = "".join(chunks)
+            sys.stdout.flush()
             
             print()  # New line after response
             
@@ -203,34 +240,40 @@ async def demo_interactive_streaming():
             conversation_history.append({"role": "user", "content": user_input})
             conversation_history.append({"role": "assistant", "content": full_response})
             
-            # Keep only last 10 exchanges
-            if len(conversation_history) > 20:
-                conversation_history = conversation_history[-20:]
-            
         except Exception as e:
             print(f"Error: {e}")
         
         print()
 
-async def main():
+async def main(noninteractive=False):
     """Run all streaming demos."""
     print("🏛️  NPCI Grievance Bot - Streaming Capabilities Demo")
-    print("=" * 60)
+    _rule(_SEP60)
     print("This demo showcases the new streaming functionality added to the bot.")
     print("Based on NVIDIA NeMo Guardrails streaming documentation.")
-    print("=" * 60)
-    
+    _rule(_SEP60)
+
+    # One shared bot: rails config, Colang compilation and the LLM client are
+    # built once, and every scenario reuses the same HTTP connection pool
+    bot = NPCIGrievanceBot()
+    # Pay the cold-start cost (flow init, TLS handshake) before any timers run
+    await bot.warmup()
+
     try:
-        await demo_streaming_basic()
-        await demo_streaming_vs_non_streaming()
-        await demo_streaming_with_context()
-        await demo_streaming_error_handling()
+        await demo_streaming_basic(bot)
+        await demo_streaming_vs_non_streaming(bot)
+        await demo_streaming_with_context(bot)
+        await demo_streaming_error_handling(bot)
         
-        # Ask if user wants interactive demo
-        print("\n" + "=" * 60)
-        response = input("Would you like to try the interactive streaming demo? (y/n): ").lower().strip()
-        if response in ['y', 'yes']:
-            await demo_interactive_streaming()
+        # Ask if user wants interactive demo; in CI/scripted runs the prompt
+        # would block the event loop on a human who is not there
+        if not noninteractive and sys.stdin.isatty():
+            _rule(_SEP60, prefix="\n")
+            response = (await asyncio.to_thread(
+                input, "Would you like to try the interactive streaming demo? (y/n): "
+            )).lower().strip()
+            if response in ['y', 'yes']:
+                await demo_interactive_streaming(bot)
         
     except KeyboardInterrupt:
         print("\n\n👋 Demo interrupted by user.")
@@ -250,4 +293,10 @@ async def main():
     print("   • Interactive chat (chat.py)")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="NPCI Grievance Bot streaming demo")
+    parser.add_argument(
+        "--noninteractive", action="store_true",
+        help="run the scripted scenarios and exit without prompting"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(noninteractive=args.noninteractive))
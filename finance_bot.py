@@ -1,5 +1,9 @@
 import asyncio
+import functools
 import os
+import pickle
+import re
+from types import MappingProxyType
 from typing import Dict, Any, List, AsyncIterator
 from dotenv import load_dotenv
 from nemoguardrails import LLMRails, RailsConfig
@@ -9,13 +13,250 @@ from nemoguardrails.streaming import StreamingHandler
 # Load environment variables
 load_dotenv()
 
+# Optional, like orjson in config/actions.py: a libuv-backed event loop
+# noticeably cuts scheduling overhead for this I/O-bound workload, but the
+# stdlib loop is a fine fallback (uvloop is unavailable on Windows)
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
+# Hoisted out of the wrapper methods: a failure surfaces once at import
+# instead of a per-call IMPORT_NAME + sys.modules walk on every request
+from config.actions import (
+    create_grievance as _create_grievance,
+    get_grievance_status as _get_grievance_status,
+    check_compliance as _check_compliance,
+    check_for_sensitive_info as _check_for_sensitive_info,
+    handle_upi_grievance as _handle_upi_grievance,
+    handle_mandate_issues as _handle_mandate_issues,
+    provide_npci_faq as _provide_npci_faq,
+    simple_jailbreak_check as _simple_jailbreak_check,
+)
+
+
+# generate_async returns either a dict or a message object depending on the
+# NeMo Guardrails version; the shape is fixed for the life of the process, so
+# the isinstance branch is resolved once and a specialised extractor is bound
+# on the bot (see process_message / stream_message_with_handler)
+def _extract_dict(raw):
+    return (
+        raw.get("content", ""),
+        raw.get("intent", "unknown"),
+        raw.get("sensitive_detected", False),
+        raw.get("requires_disclaimer", False),
+    )
+
+
+def _extract_obj(raw):
+    return (
+        getattr(raw, "content", ""),
+        getattr(raw, "intent", "unknown"),
+        getattr(raw, "sensitive_detected", False),
+        getattr(raw, "requires_disclaimer", False),
+    )
+
+
+# Deterministic fast paths: queries the action layer can answer outright
+# skip the whole rails generation (milliseconds instead of an LLM roundtrip)
+_GRIEVANCE_ID_RE = re.compile(r"\bNPCI\d{6}\b", re.IGNORECASE)
+_STATUS_KW_RE = re.compile(r"\b(?:status|track|update)\b", re.IGNORECASE)
+# Anchored to near-exact question forms: a loose keyword proximity match
+# ("My UPI pin is safe with me, but my payment failed") must not hijack a
+# real support request with a canned FAQ answer
+_FAQ_FASTPATH_RE = re.compile(
+    r"^\s*(?:"
+    r"(?P<upi_safety>(?:is\s+upi\s+safe|how\s+safe\s+is\s+upi"
+    r"|is\s+it\s+safe\s+to\s+use\s+upi))"
+    r"|(?P<what_is_npci>what\s+is\s+npci)"
+    r")\s*\??\s*$",
+    re.IGNORECASE,
+)
+
+
+def _safe(fn):
+    """Wrap an action so failures come back as {"success": False, "error": ...}."""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await fn(*args, **kwargs)
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    return wrapper
+
+
+def _load_rails_config(config_path: str) -> RailsConfig:
+    """Load the pre-parsed config pickle if present and fresh, else parse.
+
+    scripts/build_rails_cache.py writes (newest_config_mtime, config);
+    the stamp check means an edited config file silently falls back to a
+    full parse rather than serving stale flows.
+    """
+    cache_file = os.path.join(config_path, ".rails_cache.pkl")
+    try:
+        with open(cache_file, "rb") as f:
+            stamp, config = pickle.load(f)
+        newest = max(
+            os.path.getmtime(os.path.join(root, name))
+            for root, _, files in os.walk(config_path)
+            for name in files
+            if name != ".rails_cache.pkl"
+        )
+        if newest <= stamp:
+            return config
+    except Exception:
+        # Any unusable cache (missing, truncated, or pickled under a
+        # different nemoguardrails version, which surfaces as
+        # ModuleNotFoundError/AttributeError during unpickling) falls
+        # back to a full parse rather than failing bot construction
+        pass
+    return RailsConfig.from_path(config_path)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_rails(config_path: str) -> LLMRails:
+    """Build (once per process) the LLMRails object for a config path.
+
+    RailsConfig.from_path parses YAML and compiles Colang flows - hundreds
+    of milliseconds - so every bot instance for the same path shares one
+    rails object instead of rebuilding it.
+    """
+    return LLMRails(config=_load_rails_config(config_path))
+
+
+class _GenerateBatcher:
+    """Coalesce concurrent generate_async calls into grouped dispatches.
+
+    NeMo Guardrails has no list-of-prompts API, so a "batch" here is one
+    asyncio.gather over the requests collected within a short window: the
+    underlying LLM server sees them arrive together and can fill its own
+    continuous-batching pipeline instead of receiving a dribble of
+    batch-size-1 calls. Mirrors the batch worker in config/actions.py.
+    """
+
+    _MAX_BATCH = 8
+    _MAX_WAIT = 0.02  # seconds to linger for more requests
+
+    def __init__(self, rails: LLMRails, sem_factory):
+        self._rails = rails
+        # Called per generate so the semaphore always belongs to the loop
+        # the worker is running on (see NPCIGrievanceBot._gen_sem)
+        self._sem_factory = sem_factory
+        self._loop = None
+        self._queue: asyncio.Queue = None
+        self._worker = None
+
+    async def submit(self, messages: List[Dict]) -> Any:
+        """Queue one request and wait for its result."""
+        loop = asyncio.get_running_loop()
+        # The queue and worker are bound to the loop that created them. A
+        # worker parked on a dead loop is not .done(), so the loop identity
+        # is checked explicitly - pytest and TestClient run each test on a
+        # fresh loop, and enqueueing onto the stale queue would await a
+        # future no live worker ever resolves.
+        if (
+            loop is not self._loop
+            or self._worker is None
+            or self._worker.done()
+        ):
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run(self._queue))
+        future = loop.create_future()
+        self._queue.put_nowait((messages, future))
+        return await future
+
+    async def _generate(self, messages):
+        async with self._sem_factory():
+            return await self._rails.generate_async(messages=messages)
+
+    async def _run(self, queue: asyncio.Queue):
+        # The queue is passed in rather than read from self so a rebuild
+        # for a newer loop cannot swap it out from under a running batch
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            try:
+                deadline = loop.time() + self._MAX_WAIT
+                while len(batch) < self._MAX_BATCH:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(
+                            await asyncio.wait_for(queue.get(), remaining)
+                        )
+                    except asyncio.TimeoutError:
+                        break
+
+                results = await asyncio.gather(
+                    *(self._generate(m) for m, _ in batch),
+                    return_exceptions=True,
+                )
+            except BaseException as e:
+                # Worker died mid-batch (cancellation included): resolve
+                # the collected futures so no caller waits forever, then
+                # let the task end - the next submit() restarts it
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                raise
+            for (_, future), result in zip(batch, results):
+                if future.cancelled():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
 class NPCIGrievanceBot:
+    # Fixed attribute set: slots give direct-offset access on the hot
+    # self.rails / self._batcher dereferences and drop the per-instance dict
+    __slots__ = ("rails", "config", "_gen_limit", "_gen_sems", "_batcher", "_extract")
+
+    # Constant half of the response metadata, frozen and spread into each
+    # per-call dict - the keys are pre-interned so the copy is cheaper than
+    # rebuilding the full literal every request
+    _META_BASE = MappingProxyType({
+        "compliance_checked": True,
+        "service_type": "NPCI",
+        "bot_type": "npci_grievance_bot",
+    })
+
     def __init__(self):
         """Initialize the NPCI Grievance Bot with NeMoGuardrails configuration."""
-        # Load configuration from the config directory
-        self.config = RailsConfig.from_path("config")
-        self.rails = LLMRails(config=self.config)
-        
+        # Shared process-wide rails instance for the config directory
+        self.rails = _get_rails("config")
+        self.config = self.rails.config
+        # Admission control: without a bound, N simultaneous callers all
+        # pile into generate_async and oversubscribe the LLM backend.
+        # Semaphores are created per loop via _gen_sem() - see its docstring.
+        self._gen_limit = int(os.getenv("RAILS_MAX_CONCURRENCY", "16"))
+        self._gen_sems: Dict = {}
+        self._batcher = _GenerateBatcher(self.rails, self._gen_sem)
+        self._extract = None  # bound on first response (dict vs object shape)
+
+    def _gen_sem(self) -> asyncio.Semaphore:
+        """Return the admission semaphore for the running event loop.
+
+        asyncio primitives bind to the loop that first awaits them, so one
+        shared Semaphore would raise "bound to a different event loop" as
+        soon as the process-cached bot is reused on a second loop under
+        contention - the same cross-loop reuse the batcher rebuild exists
+        to support. Closed loops are pruned so suites that spin up many
+        short-lived loops do not accumulate entries.
+        """
+        loop = asyncio.get_running_loop()
+        sem = self._gen_sems.get(loop)
+        if sem is None:
+            for stale in [l for l in self._gen_sems if l.is_closed()]:
+                del self._gen_sems[stale]
+            sem = self._gen_sems[loop] = asyncio.Semaphore(self._gen_limit)
+        return sem
+
+    
     async def process_message(self, user_message: str, user_id: str = "default_user", conversation_history: List[Dict] = None) -> Dict[str, Any]:
         """
         Process a user message through the NPCI Grievance Bot system with context retention.
@@ -28,34 +269,33 @@ class NPCIGrievanceBot:
         Returns:
             Dictionary containing the bot's response and NPCI service metadata
         """
+        fast = await self._fast_path(user_message, user_id)
+        if fast is not None:
+            return fast
+
         try:
-            # Build message history for context
-            messages = []
-            
-            # Add conversation history if provided
+            # Build message history for context in one allocation. Callers
+            # should hold a deque(maxlen=10) per session so bounding the
+            # history is O(1) on their side; any iterable of messages works.
             if conversation_history:
                 # Limit to last 10 messages for context (prevent token overflow)
-                recent_history = conversation_history[-10:]
-                messages.extend(recent_history)
-            
-            # Add current user message
-            messages.append({"role": "user", "content": user_message})
-            
-            # Process through NeMoGuardrails with full context
-            raw = await self.rails.generate_async(messages=messages)
-
-            # Depending on NeMoGuardrails version, generate_async may return
-            # a dict or an object with .content
-            if isinstance(raw, dict):
-                bot_msg = raw.get("content", "")
-                intent_val = raw.get("intent", "unknown")
-                sensitive = raw.get("sensitive_detected", False)
-                disclaimer = raw.get("requires_disclaimer", False)
+                messages = [*list(conversation_history)[-10:],
+                            {"role": "user", "content": user_message}]
             else:
-                bot_msg = getattr(raw, "content", "")
-                intent_val = getattr(raw, "intent", "unknown")
-                sensitive = getattr(raw, "sensitive_detected", False)
-                disclaimer = getattr(raw, "requires_disclaimer", False)
+                messages = [{"role": "user", "content": user_message}]
+            
+            # Process through NeMoGuardrails with full context; concurrent
+            # callers are coalesced so the LLM backend sees them together
+            raw = await self._batcher.submit(messages)
+
+            if self._extract is None:
+                self._extract = _extract_dict if isinstance(raw, dict) else _extract_obj
+            bot_msg, intent_val, sensitive, disclaimer = self._extract(raw)
+            # Coerce to JSON-native types so the HTTP layer's serializer
+            # (orjson in webui_server) stays on its fast path
+            intent_val = str(intent_val)
+            sensitive = bool(sensitive)
+            disclaimer = bool(disclaimer)
 
             return {
                 "success": True,
@@ -63,13 +303,11 @@ class NPCIGrievanceBot:
                 "user_id": user_id,
                 "intent": intent_val,
                 "metadata": {
-                    "compliance_checked": True,
+                    **self._META_BASE,
                     "sensitive_info_detected": sensitive,
                     "requires_disclaimer": disclaimer,
-                    "service_type": "NPCI",
-                    "bot_type": "npci_grievance_bot",
                     "context_messages": len(messages),
-                    "has_conversation_history": conversation_history is not None and len(conversation_history) > 0
+                    "has_conversation_history": bool(conversation_history)
                 }
             }
             
@@ -80,73 +318,87 @@ class NPCIGrievanceBot:
                 "user_id": user_id
             }
     
-    async def create_grievance(self, user_id: str, category: str, description: str, priority: str = "medium") -> Dict[str, Any]:
-        """Create a new grievance ticket."""
-        try:
-            # Import the action directly for better error handling
-            from config.actions import create_grievance
-            result = await create_grievance(
-                user_id=user_id,
-                category=category,
-                description=description,
-                priority=priority
-            )
-            return result
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-    
-    async def get_grievance_status(self, grievance_id: str) -> Dict[str, Any]:
-        """Get the status of a grievance."""
-        try:
-            from config.actions import get_grievance_status
-            result = await get_grievance_status(grievance_id=grievance_id)
-            return result
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-    
-    async def check_compliance(self, message: str) -> Dict[str, Any]:
-        """Check message compliance with NPCI policies."""
-        try:
-            from config.actions import check_compliance
-            result = await check_compliance(message=message)
-            return result
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-    
-    async def handle_upi_issue(self, issue_type: str, transaction_ref: str = "", description: str = "") -> Dict[str, Any]:
-        """Handle UPI-specific issues and provide resolution guidance."""
-        try:
-            from config.actions import handle_upi_grievance
-            result = await handle_upi_grievance(
-                issue_type=issue_type,
-                transaction_ref=transaction_ref,
-                description=description
-            )
-            return result
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-    
-    async def handle_mandate_issue(self, mandate_type: str, issue_description: str = "") -> Dict[str, Any]:
-        """Handle NPCI mandate-related issues."""
+    async def _fast_path(self, user_message: str, user_id: str):
+        """Answer deterministic queries from the action layer directly.
+
+        Returns a process_message-shaped dict, or None to fall through to
+        the rails generation.
+        """
+        id_match = _GRIEVANCE_ID_RE.search(user_message)
+        faq_match = None if id_match else _FAQ_FASTPATH_RE.match(user_message)
+        if id_match is None and faq_match is None:
+            return None
+
+        # The fast path skips the rails entirely, so it must not skip their
+        # input moderation: run the cheap local checks and hand anything
+        # suspicious to the full rails pipeline (Llama Guard included)
+        jailbreak, sensitive = await asyncio.gather(
+            _simple_jailbreak_check(user_message),
+            _check_for_sensitive_info(user_message),
+        )
+        if jailbreak["is_jailbreak"] or sensitive["contains_sensitive_data"]:
+            return None
+
+        if id_match and _STATUS_KW_RE.search(user_message):
+            grievance_id = id_match.group().upper()
+            result = await _get_grievance_status(grievance_id=grievance_id)
+            if result.get("success"):
+                grievance = result["grievance"]
+                response = (
+                    f"Your grievance {grievance_id} is currently "
+                    f"'{grievance.get('status', 'unknown')}' with "
+                    f"{grievance.get('priority', 'medium')} priority."
+                )
+                return self._fast_result(response, "grievance_status", user_id)
+            return None  # unknown id - let the rails explain
+
+        if faq_match:
+            result = await _provide_npci_faq(query_type=faq_match.lastgroup)
+            return self._fast_result(result["answer"], "faq", user_id)
+
+        return None
+
+    @classmethod
+    def _fast_result(cls, response: str, intent: str, user_id: str) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "response": response,
+            "user_id": user_id,
+            "intent": intent,
+            "metadata": {
+                **cls._META_BASE,
+                "sensitive_info_detected": False,
+                "requires_disclaimer": False,
+                "context_messages": 1,
+                "has_conversation_history": False,
+                "fast_path": True,
+            },
+        }
+
+    async def warmup(self) -> None:
+        """Issue a throwaway request so later calls skip the cold-start cost.
+
+        The first generate_async call pays for prompt-template rendering,
+        Colang flow initialization and the LLM client's TCP/TLS handshake.
+        Errors and timeouts are swallowed - warmup is best-effort.
+        """
         try:
-            from config.actions import handle_mandate_issues
-            result = await handle_mandate_issues(
-                mandate_type=mandate_type,
-                issue_description=issue_description
+            await asyncio.wait_for(
+                self.process_message("ping", "warmup"), timeout=10
             )
-            return result
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-    
-    async def get_npci_faq(self, query_type: str) -> Dict[str, Any]:
-        """Get answers to NPCI FAQ questions."""
-        try:
-            from config.actions import provide_npci_faq
-            result = await provide_npci_faq(query_type=query_type)
-            return result
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-    
+        except Exception:
+            pass
+
+    # Thin pass-throughs to the config.actions layer. All six shared the
+    # same five-line try/await/except body, so the error-to-dict conversion
+    # lives in one _safe wrapper and each call costs a single indirection.
+    create_grievance = staticmethod(_safe(_create_grievance))
+    get_grievance_status = staticmethod(_safe(_get_grievance_status))
+    check_compliance = staticmethod(_safe(_check_compliance))
+    handle_upi_issue = staticmethod(_safe(_handle_upi_grievance))
+    handle_mandate_issue = staticmethod(_safe(_handle_mandate_issues))
+    get_npci_faq = staticmethod(_safe(_provide_npci_faq))
+
     async def stream_message(self, user_message: str, user_id: str = "default_user", conversation_history: List[Dict] = None) -> AsyncIterator[str]:
         """
         Stream a user message response through the NPCI Grievance Bot system using optimized NeMo streaming.
@@ -160,29 +412,28 @@ class NPCIGrievanceBot:
             String chunks of the bot's response as they are generated
         """
         try:
-            # Build message history for context
-            messages = []
-            
-            # Add conversation history if provided
+            # Build message history for context (deque-friendly, see
+            # process_message). Last 8 messages, optimized for streaming.
             if conversation_history:
-                # Limit to last 8 messages for context (optimized for streaming performance)
-                recent_history = conversation_history[-8:]
-                messages.extend(recent_history)
-            
-            # Add current user message
-            messages.append({"role": "user", "content": user_message})
+                messages = [*list(conversation_history)[-8:],
+                            {"role": "user", "content": user_message}]
+            else:
+                messages = [{"role": "user", "content": user_message}]
             
-            # Use NeMo Guardrails standard streaming API
-            async for chunk in self.rails.stream_async(messages=messages):
-                # Only yield non-empty chunks
-                if chunk and chunk.strip():
-                    yield chunk
+            # Use NeMo Guardrails standard streaming API; the semaphore
+            # bounds concurrent generations across streaming and batch paths
+            async with self._gen_sem():
+                async for chunk in self.rails.stream_async(messages=messages):
+                    # Only yield non-empty chunks; isspace runs in C without
+                    # allocating the stripped copy strip() would build
+                    if chunk and not chunk.isspace():
+                        yield chunk
                 
         except Exception as e:
             # Yield error message as a single chunk
             yield f"I apologize, but I encountered an error processing your request: {str(e)}"
     
-    async def stream_message_with_handler(self, user_message: str, user_id: str = "default_user", conversation_history: List[Dict] = None) -> tuple[AsyncIterator[str], Dict[str, Any]]:
+    async def stream_message_with_handler(self, user_message: str, user_id: str = "default_user", conversation_history: List[Dict] = None) -> tuple[AsyncIterator[str], "asyncio.Task"]:
         """
         Stream a user message response with full response handling.
         
@@ -192,31 +443,65 @@ class NPCIGrievanceBot:
             conversation_history: Previous messages in the conversation
             
         Returns:
-            Tuple of (streaming_iterator, final_response_dict)
+            Tuple of (streaming_iterator, final_response_task). Generation
+            runs concurrently with the iterator; await the task after (or
+            while) draining chunks to get the process_message-style dict.
+            Awaiting it first would serialize the whole generation before
+            the first chunk is delivered.
         """
         try:
-            # Build message history for context
-            messages = []
-            
-            # Add conversation history if provided
+            # Build message history for context (deque-friendly, see
+            # process_message)
             if conversation_history:
-                recent_history = conversation_history[-10:]
-                messages.extend(recent_history)
-            
-            # Add current user message
-            messages.append({"role": "user", "content": user_message})
+                messages = [*list(conversation_history)[-10:],
+                            {"role": "user", "content": user_message}]
+            else:
+                messages = [{"role": "user", "content": user_message}]
             
             # Create streaming handler
             streaming_handler = StreamingHandler()
             
-            # Start the generation task
             async def get_final_response():
-                return await self.rails.generate_async(
-                    messages=messages, 
-                    streaming_handler=streaming_handler
-                )
+                # Failures inside the background task resolve it to the
+                # standard error envelope instead of raising into the void
+                # (a task exception nobody awaits is only ever a warning
+                # at garbage-collection time)
+                try:
+                    async with self._gen_sem():
+                        raw = await self.rails.generate_async(
+                            messages=messages, 
+                            streaming_handler=streaming_handler
+                        )
+                except Exception as e:
+                    return {
+                        "success": False,
+                        "error": str(e),
+                        "user_id": user_id,
+                        "metadata": {"streaming_enabled": True}
+                    }
+
+                # Process final response similar to process_message
+                if self._extract is None:
+                    self._extract = _extract_dict if isinstance(raw, dict) else _extract_obj
+                bot_msg, intent_val, sensitive, disclaimer = self._extract(raw)
+
+                return {
+                    "success": True,
+                    "response": bot_msg,
+                    "user_id": user_id,
+                    "intent": str(intent_val),
+                    "metadata": {
+                        **self._META_BASE,
+                        "sensitive_info_detected": bool(sensitive),
+                        "requires_disclaimer": bool(disclaimer),
+                        "context_messages": len(messages),
+                        "has_conversation_history": bool(conversation_history),
+                        "streaming_enabled": True
+                    }
+                }
             
-            # Create task for final response
+            # Generation proceeds in the background while the caller drains
+            # the iterator - chunks flow as they are produced
             response_task = asyncio.create_task(get_final_response())
             
             # Create async iterator for chunks
@@ -224,125 +509,41 @@ class NPCIGrievanceBot:
                 async for chunk in streaming_handler:
                     yield chunk
             
-            # Wait for final response
-            final_response = await response_task
-            
-            # Process final response similar to process_message
-            if isinstance(final_response, dict):
-                bot_msg = final_response.get("content", "")
-                intent_val = final_response.get("intent", "unknown")
-                sensitive = final_response.get("sensitive_detected", False)
-                disclaimer = final_response.get("requires_disclaimer", False)
-            else:
-                bot_msg = getattr(final_response, "content", "")
-                intent_val = getattr(final_response, "intent", "unknown")
-                sensitive = getattr(final_response, "sensitive_detected", False)
-                disclaimer = getattr(final_response, "requires_disclaimer", False)
-
-            response_dict = {
-                "success": True,
-                "response": bot_msg,
-                "user_id": user_id,
-                "intent": intent_val,
-                "metadata": {
-                    "compliance_checked": True,
-                    "sensitive_info_detected": sensitive,
-                    "requires_disclaimer": disclaimer,
-                    "service_type": "NPCI",
-                    "bot_type": "npci_grievance_bot",
-                    "context_messages": len(messages),
-                    "has_conversation_history": conversation_history is not None and len(conversation_history) > 0,
-                    "streaming_enabled": True
-                }
-            }
-            
-            return chunk_iterator(), response_dict
+            return chunk_iterator(), response_task
             
         except Exception as e:
+            # Bind the message now: Python unbinds `e` when the except block
+            # exits, so closures that run later (the iterator is drained and
+            # the task awaited after this returns) would hit a NameError
+            # instead of reporting the error
+            msg = str(e)
+
             # Return error iterator and response
             async def error_iterator():
-                yield f"I apologize, but I encountered an error: {str(e)}"
-            
-            error_response = {
-                "success": False,
-                "error": str(e),
-                "user_id": user_id,
-                "metadata": {"streaming_enabled": True}
-            }
-            
-            return error_iterator(), error_response
+                yield f"I apologize, but I encountered an error: {msg}"
 
-# Global bot instance
-npci_bot = NPCIGrievanceBot()
+            async def error_response():
+                return {
+                    "success": False,
+                    "error": msg,
+                    "user_id": user_id,
+                    "metadata": {"streaming_enabled": True}
+                }
 
-async def main():
-    """Main function to demonstrate the NPCI Grievance Bot capabilities."""
-    print("🏛️ NPCI Grievance Bot - NeMoGuardrails Demo")
-    print("=" * 60)
-    
-    # Test 1: UPI grievance creation
-    print("\n📝 Test 1: Creating a UPI grievance")
-    grievance_result = await npci_bot.create_grievance(
-        user_id="user123",
-        category="upi_transaction_failure",
-        description="UPI payment failed but money was debited from my account",
-        priority="high"
-    )
-    print(f"UPI Grievance Result: {grievance_result}")
-    
-    # Test 2: Processing UPI message
-    print("\n💬 Test 2: Processing UPI user message")
-    user_message = "My UPI payment failed but money was debited. Transaction ref: 304912345678"
-    response = await npci_bot.process_message(user_message, "user123")
-    if response.get("success") and "response" in response:
-        print(f"Bot Response: {response['response'][:200]}...")
-    else:
-        print(f"Bot Error: {response.get('error', 'Unknown error')}")
-    
-    # Test 2b: Context retention test
-    print("\n🧠 Test 2b: Context retention test")
-    conversation_history = [
-        {"role": "user", "content": "My UPI payment failed but money was debited"},
-        {"role": "assistant", "content": "I understand your UPI payment issue. Let me help you resolve this."}
-    ]
-    followup_message = "It was for 500 rupees"
-    context_response = await npci_bot.process_message(followup_message, "user123", conversation_history)
-    if context_response.get("success"):
-        metadata = context_response.get("metadata", {})
-        print(f"Context Messages: {metadata.get('context_messages', 0)}")
-        print(f"Has Context: {metadata.get('has_conversation_history', False)}")
-        print(f"Context Response: {context_response['response'][:200]}...")
-    else:
-        print(f"Context Error: {context_response.get('error', 'Unknown error')}")
-    
-    # Test 3: UPI specific issue handling
-    print("\n🔧 Test 3: UPI issue handling")
-    upi_result = await npci_bot.handle_upi_issue(
-        issue_type="money_debited",
-        transaction_ref="304912345678",
-        description="Money debited but payment failed"
-    )
-    print(f"UPI Resolution: {upi_result}")
-    
-    # Test 4: NPCI FAQ
-    print("\n❓ Test 4: NPCI FAQ")
-    faq_result = await npci_bot.get_npci_faq("upi_safety")
-    print(f"FAQ Result: {faq_result}")
-    
-    # Test 5: Mandate issue handling
-    print("\n📋 Test 5: Mandate issue handling")
-    mandate_result = await npci_bot.handle_mandate_issue(
-        mandate_type="e_NACH",
-        issue_description="Auto debit failed for EMI payment"
-    )
-    print(f"Mandate Resolution: {mandate_result}")
-    
-    # Test 6: Grievance status check
-    if grievance_result.get("success"):
-        grievance_id = grievance_result.get("grievance_id")
-        print(f"\n📊 Test 6: Checking grievance status for {grievance_id}")
-        status_result = await npci_bot.get_grievance_status(grievance_id)
-        print(f"Status Result: {status_result}")
-
-if __name__ == "__main__":
-    asyncio.run(main())
+            return error_iterator(), asyncio.create_task(error_response())
+
+# Historical alias: earlier revisions shipped a separate FinanceBot class
+# that duplicated this implementation; several demos and tests still import
+# the old name
+FinanceBot = NPCIGrievanceBot
+
+
+@functools.lru_cache(maxsize=None)
+def get_default_bot() -> NPCIGrievanceBot:
+    """Convenience accessor for a shared bot instance.
+
+    Replaces the old module-level npci_bot global, which ran the full
+    rails construction as an import side effect and made
+    `import finance_bot` a multi-second operation for web workers.
+    """
+    return NPCIGrievanceBot()
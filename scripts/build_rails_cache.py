@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Pre-parse the rails configuration into a pickle cache.
+
+RailsConfig.from_path walks the config directory, parses YAML and Colang,
+and builds the flow graphs - work that every worker process repeats at
+boot. Running this script once at build/deploy time lets workers
+pickle.load the parsed config instead (see _load_rails_config in
+finance_bot.py). The cache is stamped with the newest config-file mtime
+so a stale pickle is ignored automatically.
+
+Usage:
+    python scripts/build_rails_cache.py
+"""
+
+import pickle
+from pathlib import Path
+
+from nemoguardrails import RailsConfig
+
+CONFIG_DIR = Path(__file__).resolve().parent.parent / "config"
+CACHE_FILE = CONFIG_DIR / ".rails_cache.pkl"
+
+
+def newest_config_mtime() -> float:
+    """Return the most recent mtime of any file under the config directory."""
+    return max(
+        path.stat().st_mtime
+        for path in CONFIG_DIR.rglob("*")
+        if path.is_file() and path.name != CACHE_FILE.name
+    )
+
+
+def build() -> None:
+    config = RailsConfig.from_path(str(CONFIG_DIR))
+    with open(CACHE_FILE, "wb") as f:
+        pickle.dump((newest_config_mtime(), config), f, protocol=5)
+    print(f"✅ Wrote {CACHE_FILE}")
+
+
+if __name__ == "__main__":
+    build()
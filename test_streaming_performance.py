@@ -5,82 +5,100 @@ Tests the improved streaming configuration against NeMo Guardrails standards
 """
 
 import asyncio
+import sys
 import time
 from finance_bot import NPCIGrievanceBot
 
-async def test_streaming_performance():
+async def measure_stream(bot, message, user_id, history=None):
+    """Drain one stream and time it with ns-resolution counters.
+
+    Returns (ttft_ns, total_ns, parts); ttft_ns is None if no chunk
+    arrived. perf_counter_ns is monotonic and integer math, so the
+    sub-ms TTFT readings are meaningful rather than clock jitter.
+    """
+    t0 = time.perf_counter_ns()
+    ttft = None
+    parts = []
+    async for chunk in bot.stream_message(message, user_id, history):
+        if ttft is None:
+            ttft = time.perf_counter_ns() - t0
+        parts.append(chunk)
+    return ttft, time.perf_counter_ns() - t0, parts
+
+async def test_streaming_performance(bot):
     """Test streaming performance with optimizations."""
     print("🚀 Testing Optimized Streaming Performance")
     print("=" * 60)
     
-    bot = NPCIGrievanceBot()
-    
     # Test messages of varying complexity
     test_cases = [
         "My UPI payment failed",
         "My UPI payment failed but money was debited from my account. Transaction reference: 304912345678",
         "I have a complex issue with my NACH mandate where the auto-debit failed for my EMI payment and I need immediate assistance with escalation",
     ]
-    
-    for i, test_message in enumerate(test_cases, 1):
-        print(f"\n📊 Test Case {i}: {test_message[:50]}{'...' if len(test_message) > 50 else ''}")
-        print("-" * 60)
-        
-        # Measure streaming performance
-        start_time = time.time()
-        first_chunk_time = None
-        chunk_count = 0
-        total_chars = 0
-        
-        print("Response: ", end="", flush=True)
-        
+
+    async def run_case(i, test_message):
+        # Each case buffers its report and returns it, so the concurrent
+        # cases cannot interleave their output on the console
+        report = []
+
         try:
-            async for chunk in bot.stream_message(test_message, f"perf_test_user_{i}"):
-                if first_chunk_time is None:
-                    first_chunk_time = time.time()
-                    
-                print(chunk, end="", flush=True)
-                chunk_count += 1
-                total_chars += len(chunk)
-            
-            end_time = time.time()
-            
+            ttft_ns, total_ns, parts = await measure_stream(
+                bot, test_message, f"perf_test_user_{i}"
+            )
+            chunk_count = len(parts)
+            total_chars = sum(len(part) for part in parts)
+
             # Performance metrics
-            total_time = end_time - start_time
-            time_to_first_chunk = (first_chunk_time - start_time) if first_chunk_time else total_time
-            
-            print(f"\n\n📈 Performance Metrics:")
-            print(f"   ⏱️  Time to first chunk: {time_to_first_chunk:.3f}s")
-            print(f"   ⏱️  Total response time: {total_time:.3f}s")
-            print(f"   📦 Total chunks: {chunk_count}")
-            print(f"   📏 Total characters: {total_chars}")
-            print(f"   🔄 Chars/second: {total_chars/total_time:.1f}")
-            
+            total_time = total_ns / 1e9
+            time_to_first_chunk = (ttft_ns if ttft_ns is not None else total_ns) / 1e9
+
+            report.append(f"Response: {''.join(parts)}")
+            report.append(f"\n📈 Performance Metrics:")
+            report.append(f"   ⏱️  Time to first chunk: {time_to_first_chunk:.3f}s")
+            report.append(f"   ⏱️  Total response time: {total_time:.3f}s")
+            report.append(f"   📦 Total chunks: {chunk_count}")
+            report.append(f"   📏 Total characters: {total_chars}")
+            report.append(f"   🔄 Chars/second: {total_chars/total_time:.1f}")
+
             # Performance assessment
             if time_to_first_chunk < 0.5:
-                print(f"   ✅ Excellent first chunk latency!")
+                report.append(f"   ✅ Excellent first chunk latency!")
             elif time_to_first_chunk < 1.0:
-                print(f"   👍 Good first chunk latency")
+                report.append(f"   👍 Good first chunk latency")
             else:
-                print(f"   ⚠️  High first chunk latency - needs optimization")
-                
+                report.append(f"   ⚠️  High first chunk latency - needs optimization")
+
         except Exception as e:
-            print(f"\n❌ Error: {e}")
+            report.append(f"❌ Error: {e}")
+        return report
 
-async def test_non_streaming_comparison():
+    # The cases are independent LLM round-trips, so fan them out: suite
+    # wall-clock is ~the slowest case instead of the sum of all three.
+    # Per-case TTFT still reflects contention for the bot's semaphore.
+    results = await asyncio.gather(
+        *(run_case(i, message) for i, message in enumerate(test_cases, 1))
+    )
+
+    for i, (test_message, report) in enumerate(zip(test_cases, results), 1):
+        print(f"\n📊 Test Case {i}: {test_message[:50]}{'...' if len(test_message) > 50 else ''}")
+        print("-" * 60)
+        sys.stdout.write("\n".join(report) + "\n")
+    sys.stdout.flush()
+
+async def test_non_streaming_comparison(bot):
     """Compare with non-streaming performance."""
     print(f"\n🔄 Non-Streaming Comparison")
     print("=" * 60)
-    
-    bot = NPCIGrievanceBot()
+
     test_message = "My UPI payment failed but money was debited"
     
     print("Non-streaming response:")
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         response = await bot.process_message(test_message, "non_stream_user")
-        end_time = time.time()
+        end_time = time.perf_counter()
         
         non_streaming_time = end_time - start_time
         response_text = response.get("response", "No response")
@@ -96,45 +114,37 @@ async def test_non_streaming_comparison():
         print(f"❌ Non-streaming error: {e}")
         return 0
 
-async def benchmark_streaming_optimizations():
+async def benchmark_streaming_optimizations(bot):
     """Benchmark the streaming optimizations."""
     print(f"\n🏆 Streaming Optimization Benchmark")
     print("=" * 60)
-    
-    bot = NPCIGrievanceBot()
+
     test_message = "Help me with a UPI transaction failure where money was debited but payment failed"
     
-    # Test multiple runs for consistency
+    # Test multiple runs for consistency; the bot is concurrency-safe
+    # (generation is semaphore-guarded), so the runs go out together
     runs = 3
+
+    async def run_once(run):
+        ttft_ns, total_ns, _ = await measure_stream(
+            bot, test_message, f"benchmark_user_{run}"
+        )
+        return (ttft_ns or 0) / 1e9, total_ns / 1e9
+
+    outcomes = await asyncio.gather(
+        *(run_once(run) for run in range(runs)), return_exceptions=True
+    )
+
     first_chunk_times = []
     total_times = []
-    
-    for run in range(runs):
-        print(f"\nRun {run + 1}/{runs}: ", end="", flush=True)
-        
-        start_time = time.time()
-        first_chunk_time = None
-        chunk_count = 0
-        
-        try:
-            async for chunk in bot.stream_message(test_message, f"benchmark_user_{run}"):
-                if first_chunk_time is None:
-                    first_chunk_time = time.time()
-                print(".", end="", flush=True)
-                chunk_count += 1
-            
-            end_time = time.time()
-            
-            time_to_first = (first_chunk_time - start_time) if first_chunk_time else 0
-            total_time = end_time - start_time
-            
+    for run, outcome in enumerate(outcomes, 1):
+        if isinstance(outcome, Exception):
+            print(f"Run {run}/{runs}: ❌ Error: {outcome}")
+        else:
+            time_to_first, total_time = outcome
             first_chunk_times.append(time_to_first)
             total_times.append(total_time)
-            
-            print(f" ✅ ({time_to_first:.3f}s to first chunk)")
-            
-        except Exception as e:
-            print(f" ❌ Error: {e}")
+            print(f"Run {run}/{runs}: ✅ ({time_to_first:.3f}s to first chunk)")
     
     if first_chunk_times:
         avg_first_chunk = sum(first_chunk_times) / len(first_chunk_times)
@@ -155,13 +165,11 @@ async def benchmark_streaming_optimizations():
         else:
             print(f"   ❌ POOR - Requires optimization")
 
-async def test_streaming_with_context():
+async def test_streaming_with_context(bot):
     """Test streaming performance with conversation context."""
     print(f"\n🧠 Context-Aware Streaming Performance")
     print("=" * 60)
     
-    bot = NPCIGrievanceBot()
-    
     # Build conversation history
     conversation_history = [
         {"role": "user", "content": "I have a UPI issue"},
@@ -175,21 +183,16 @@ async def test_streaming_with_context():
     print(f"Follow-up with context: {follow_up}")
     print("Response: ", end="", flush=True)
     
-    start_time = time.time()
-    first_chunk_time = None
-    chunk_count = 0
-    
     try:
-        async for chunk in bot.stream_message(follow_up, "context_user", conversation_history):
-            if first_chunk_time is None:
-                first_chunk_time = time.time()
-            print(chunk, end="", flush=True)
-            chunk_count += 1
-        
-        end_time = time.time()
+        ttft_ns, total_ns, parts = await measure_stream(
+            bot, follow_up, "context_user", conversation_history
+        )
+        sys.stdout.write("".join(parts))
+        sys.stdout.flush()
+        chunk_count = len(parts)
         
-        time_to_first = (first_chunk_time - start_time) if first_chunk_time else 0
-        total_time = end_time - start_time
+        time_to_first = (ttft_ns or 0) / 1e9
+        total_time = total_ns / 1e9
         
         print(f"\n\n📊 Context Streaming Performance:")
         print(f"   ⏱️  Time to first chunk: {time_to_first:.3f}s")
@@ -206,11 +209,18 @@ async def main():
     print("Testing optimizations based on NeMo Guardrails standards")
     print("=" * 60)
     
+    # One shared bot: rails config, Colang compilation and the LLM client are
+    # built once, and the warmup call pays the cold-start cost (flow init,
+    # TLS handshake) before any measured window opens - so the numbers below
+    # are steady-state TTFT, not first-run setup
+    bot = NPCIGrievanceBot()
+    await bot.warmup()
+
     try:
-        await test_streaming_performance()
-        non_streaming_time = await test_non_streaming_comparison()
-        await benchmark_streaming_optimizations()
-        await test_streaming_with_context()
+        await test_streaming_performance(bot)
+        non_streaming_time = await test_non_streaming_comparison(bot)
+        await benchmark_streaming_optimizations(bot)
+        await test_streaming_with_context(bot)
         
         print(f"\n🎉 Performance Testing Complete!")
         print(f"\n📋 Optimization Summary:")